@@ -5,13 +5,11 @@ For the command line arguments run the script with "--help".
 """
 
 import glob
+import json
+import sys
 from argparse import ArgumentParser
 import time
 
-from mora.input import InputParser, set_log_level, LOG_NOTHING
-from src import decide_termination
-from src.bounds import bounds
-
 
 HEADER = """
     _    __  __  ___  ___  ___ 
@@ -26,7 +24,6 @@ parser = ArgumentParser(description="Run Amber on probabilistic programs stored
 parser.add_argument(
     "--benchmarks",
     dest="benchmarks",
-    required=True,
     type=str,
     nargs="+",
     help="A list of benchmarks to run Amber on"
@@ -40,37 +37,242 @@ parser.add_argument(
     help="This is just a development flag. If set, it calculates the asymptotic bounds of the given expression"
 )
 
+parser.add_argument(
+    "--moments",
+    dest="moments",
+    type=int,
+    default=None,
+    metavar="DEGREE",
+    help="Instead of deciding termination, compute E[v^k] for all program variables v and all k up to the given degree "
+         "and print them as JSON"
+)
+
+parser.add_argument(
+    "--jobs",
+    dest="jobs",
+    type=int,
+    default=1,
+    help="The number of worker processes analysing benchmarks in parallel. "
+         "Results get printed in the order in which the benchmarks finish"
+)
+
+parser.add_argument(
+    "--timeout",
+    dest="timeout",
+    type=float,
+    default=None,
+    help="The number of seconds after which the analysis of a single benchmark gets aborted"
+)
+
+parser.add_argument(
+    "--max-memory",
+    dest="max_memory",
+    type=int,
+    default=None,
+    help="The number of megabytes of memory the analysis of a single benchmark can use before it gets aborted"
+)
+
+parser.add_argument(
+    "--cache",
+    dest="cache",
+    type=str,
+    default=None,
+    help="A directory in which the closed-form moments get cached, such that repeated runs don't recompute them"
+)
+
+parser.add_argument(
+    "--format",
+    dest="format",
+    choices=["text", "json", "jsonl"],
+    default="text",
+    help="The output format. 'json' prints a single list with one object per benchmark after all benchmarks are done, "
+         "'jsonl' prints one object per line as soon as a benchmark is done"
+)
+
+parser.add_argument(
+    "--parallel-rules",
+    dest="parallel_rules",
+    action="store_true",
+    help="Apply the proof rules concurrently in separate processes and stop as soon as everything is decided"
+)
+
+parser.add_argument(
+    "--moment-jobs",
+    dest="moment_jobs",
+    type=int,
+    default=1,
+    help="The number of processes solving independent monomials when computing moments"
+)
+
+parser.add_argument(
+    "--bound-jobs",
+    dest="bound_jobs",
+    type=int,
+    default=1,
+    help="The number of processes comparing candidates when a bound is selected among many candidates"
+)
+
+parser.add_argument(
+    "--numeric-prefilter",
+    dest="numeric_prefilter",
+    action="store_true",
+    help="Remove bound candidates which are clearly dominated when evaluated numerically at large n, before comparing "
+         "the remaining candidates symbolically"
+)
+
+parser.add_argument(
+    "--limit-cache-size",
+    dest="limit_cache_size",
+    type=int,
+    default=None,
+    help="The number of computed limits which are remembered (default 4096). 0 disables remembering limits"
+)
+
+parser.add_argument(
+    "--trace",
+    dest="trace",
+    type=str,
+    default=None,
+    help="A file to which a trace of the analysis gets written in the Chrome trace format (chrome://tracing)"
+)
+
+parser.add_argument(
+    "--serve",
+    dest="serve",
+    action="store_true",
+    help="Run Amber as a server answering newline-delimited JSON requests from stdin on stdout"
+)
+
+parser.add_argument(
+    "--socket",
+    dest="socket",
+    type=str,
+    default=None,
+    help="Run Amber as a server answering newline-delimited JSON requests on the given Unix socket"
+)
+
 
 def main():
-    print(HEADER)
+    args = parser.parse_args()
+    if not args.benchmarks and not args.serve and not args.socket:
+        parser.error("one of the arguments --benchmarks, --serve or --socket is required")
+    if args.bounds and args.format != "text":
+        parser.error("the argument --bounds only supports the text format")
+    if args.moments is not None and args.bounds:
+        parser.error("the arguments --moments and --bounds cannot be combined")
+    if args.moments is not None and args.moments < 1:
+        parser.error("the argument --moments requires a degree of at least 1")
+    for option, jobs in [("--jobs", args.jobs), ("--moment-jobs", args.moment_jobs), ("--bound-jobs", args.bound_jobs)]:
+        if jobs < 1:
+            parser.error(f"the argument {option} requires at least 1 process")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("the argument --timeout requires a positive number of seconds")
+    if args.max_memory is not None and args.max_memory <= 0:
+        parser.error("the argument --max-memory requires a positive number of megabytes")
+
+    # Amber and its dependencies are only imported after the arguments got parsed, as importing diofant takes
+    # a noticeable amount of time which is not needed for e.g. --help
+    from mora.input import InputParser, set_log_level, LOG_NOTHING
+    from mora.cache import set_cache_directory
+    from mora.core import set_solver_jobs
+    from mora.trace import enable_tracing, write_trace
+    from src import decide_termination
+    from src.decission import set_parallel_rules
+    from src.utils import set_limit_cache_size
+    from src.asymptotics import set_bound_jobs, set_numeric_prefilter
+    from src.bounds import bounds
+    from src.runner import run_benchmarks, analyse_benchmark, analyse_moments, Status
+    from src.server import serve, serve_socket
+
     set_log_level(LOG_NOTHING)
+    if args.cache:
+        set_cache_directory(args.cache)
+    if args.trace:
+        enable_tracing()
+    if args.parallel_rules:
+        set_parallel_rules(True)
+    if args.moment_jobs > 1:
+        set_solver_jobs(args.moment_jobs)
+    if args.bound_jobs > 1:
+        set_bound_jobs(args.bound_jobs)
+    if args.numeric_prefilter:
+        set_numeric_prefilter(True)
+    if args.limit_cache_size is not None:
+        set_limit_cache_size(args.limit_cache_size)
+
+    if args.serve:
+        serve(sys.stdin, sys.stdout)
+        return
+    if args.socket:
+        try:
+            serve_socket(args.socket)
+        except FileExistsError as e:
+            parser.error(f"the argument --socket cannot be used: {e}")
+        return
 
-    args = parser.parse_args()
     args.benchmarks = [b for bs in map(glob.glob, args.benchmarks) for b in bs]
 
-    for benchmark in args.benchmarks:
-        if args.bounds:
-            bounds(benchmark, args.bounds)
-        else:
-            program = None
-            try:
-                input_parser = InputParser()
-                input_parser.set_source(benchmark)
-                program = input_parser.parse_source()
-            except Exception as e:
-                print("Amber failed to parse source.")
-                print(e)
-                return
-
-            try:
-                start = time.time()
-                result = decide_termination(program)
-                result.print()
-                print(f"Computation time: { round(time.time() - start, 4) }s")
-            except Exception as e:
-                print("Something went wrong while deciding termination.")
-                print(e)
-                return
+    try:
+        # Moments are always printed as JSON, in the text format as a single list like in the json format
+        if args.format != "text" or args.moments is not None:
+            if args.jobs > 1 or args.timeout or args.max_memory:
+                runs = run_benchmarks(args.benchmarks, args.jobs, timeout=args.timeout, max_memory=args.max_memory,
+                                      structured=True, moments_degree=args.moments)
+                results = (data for _, _, data in runs)
+            elif args.moments is not None:
+                results = (analyse_moments(benchmark, args.moments) for benchmark in args.benchmarks)
+            else:
+                results = (analyse_benchmark(benchmark) for benchmark in args.benchmarks)
+
+            if args.format == "jsonl":
+                for data in results:
+                    print(json.dumps(data), flush=True)
+            else:
+                print(json.dumps(list(results), indent=2))
+            return
+
+        print(HEADER)
+        if args.jobs > 1 or args.timeout or args.max_memory:
+            runs = run_benchmarks(args.benchmarks, args.jobs, args.bounds, args.timeout, args.max_memory)
+            for benchmark, status, output in runs:
+                print(f"Benchmark: {benchmark}")
+                if status is Status.OK:
+                    print(output)
+                else:
+                    print(f"{status}: The analysis was aborted.")
+                    if output:
+                        print(output)
+                    print("PAST: Maybe")
+                    print("AST: Maybe")
+                    print()
+            return
+
+        for benchmark in args.benchmarks:
+            if args.bounds:
+                bounds(benchmark, args.bounds)
+            else:
+                program = None
+                try:
+                    input_parser = InputParser()
+                    input_parser.set_source(benchmark)
+                    program = input_parser.parse_source()
+                except Exception as e:
+                    print("Amber failed to parse source.")
+                    print(e)
+                    return
+
+                try:
+                    start = time.time()
+                    result = decide_termination(program)
+                    result.print()
+                    print(f"Computation time: { round(time.time() - start, 4) }s")
+                except Exception as e:
+                    print("Something went wrong while deciding termination.")
+                    print(e)
+                    return
+    finally:
+        if args.trace:
+            write_trace(args.trace)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""This file is part of MORA
+
+This file contains a persistent cache for the closed-form solutions of E-variables. Solutions are stored as
+pickle files in a directory and are keyed by a hash of the program (its updates and initial values) together
+with the monomial. The cache is disabled unless a directory is set.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+from diofant import Expr, srepr
+
+cache_directory: str = None
+
+# Is part of every key and has to be increased whenever the solver computes different solutions than before (e.g.
+# other moments of a distribution) or the format of the entries changes, such that outdated entries are not served
+CACHE_VERSION = 2
+
+
+def set_cache_directory(directory: str):
+    """
+    Enables the cache and stores all solutions in the given directory. Passing None disables the cache.
+    """
+    global cache_directory
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    cache_directory = directory
+
+
+def cache_enabled() -> bool:
+    return cache_directory is not None
+
+
+def get_program_key(program) -> str:
+    """
+    Returns a canonical hash of the updates and initial values of a given program and the version of the cache
+    """
+    parts = [f"version {CACHE_VERSION}"]
+    for variable, update in program.updates.items():
+        parts.append(f"{srepr(variable)} := {__update_repr(update)}")
+    for variable, initial_value in sorted(program.initial_values.items(), key=lambda i: str(i[0])):
+        parts.append(f"{srepr(variable)} = {__update_repr(initial_value)}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def __update_repr(update) -> str:
+    if update.is_random_var and update.random_var.distribution != "finite":
+        parameters = ", ".join(map(srepr, update.random_var.parameters))
+        return f"RV({update.random_var.distribution}, {parameters})"
+
+    branches = update.branches if hasattr(update, "branches") else update.random_var.parameters
+    return "; ".join(f"{srepr(b)} @ {srepr(p)}" for b, p in branches)
+
+
+def load_solution(program_key: str, monomial: Expr):
+    """
+    Returns the cached solution for a monomial of the program with the given key or None if there is none
+    """
+    path = __get_path(program_key, monomial)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def store_solution(program_key: str, monomial: Expr, solution: Expr):
+    """
+    Stores the solution of a monomial of the program with the given key
+    """
+    path = __get_path(program_key, monomial)
+    # Write to a temporary file first, such that concurrent readers never see a partially written solution
+    fd, tmp_path = tempfile.mkstemp(dir=cache_directory)
+    with os.fdopen(fd, "wb") as file:
+        pickle.dump(solution, file)
+    os.replace(tmp_path, path)
+
+
+def __get_path(program_key: str, monomial: Expr) -> str:
+    key = hashlib.sha256(f"{program_key}\n{srepr(monomial)}".encode()).hexdigest()
+    return os.path.join(cache_directory, f"{key}.pickle")
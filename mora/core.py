@@ -1,5 +1,11 @@
+from functools import partial
+
 from diofant import Symbol, sympify, simplify, expand, Expr, Poly, symbols, summation
 from mora.utils import *
+from mora.cache import cache_enabled, get_program_key, load_solution, store_solution
+from mora.exppoly import ExpPoly, solve_recurrence, solve_recurrence_in_closed_form
+from mora.processes import run_forked
+from mora.trace import traced
 from typing import List, Dict, Set
 
 
@@ -14,55 +20,111 @@ class Program:
         self.updates: Dict[Symbol, Update] = {}
         self.ancestors: Dict[Symbol, Set[Symbol]] = {}
         self.dependencies: Dict[Symbol, Set[Symbol]] = {}
+        self.cache_key: str = None
 
 
-# Stores the solutions of E-variables
-solution_store = {}
+class Context:
+    """
+    The state of the analysis of a single program. It owns the stores of the solutions and recurrences of E-variables,
+    such that consecutive queries on the same program share their results and several programs can be analysed in the
+    same process independently of each other. A context must not be shared between threads, as its stores are not
+    locked.
+    """
+    def __init__(self, program: Program):
+        self.program: Program = program
+        # Stores the solutions of E-variables
+        self.solution_store: Dict[Expr, Expr] = {}
+        # Stores the recurrences of E-variables
+        self.recurrence_store: Dict[Expr, Poly] = {}
 
-# Stores the recurrences of E-variables
-recurrence_store = {}
+# The number of processes solving independent monomials of a recurrence system at the same time
+solver_jobs = 1
 
 
-def reset_mora():
-    global solution_store, recurrence_store
-    solution_store = {}
-    recurrence_store = {}
+def set_solver_jobs(jobs: int):
+    global solver_jobs
+    solver_jobs = jobs
 
 
-def core(program: Program, goal_monomials: List[Expr] = None, goal_power: int = 1):
+def core(program: Program, goal_monomials: List[Expr] = None, goal_power: int = 1, context: Context = None):
     """
     Returns the expected values of given monomials raised to a given power. If no monomials are given the expected
-    values of all program variables get computed.
+    values of all program variables get computed. If no context is given, the analysis starts from a fresh one.
     """
-    global solution_store, recurrence_store
-    reset_mora()
+    if context is None:
+        context = Context(program)
     if goal_monomials is None:
         goal_monomials = [v**goal_power for v in program.variables]
 
     goal_monomials = [m.as_poly(program.variables) for m in goal_monomials]
-    solutions = {}
     for m in goal_monomials:
-        solutions[m] = get_solution(program, m)
-    return solution_store
+        get_solution(context, m)
+    return context.solution_store
+
+
+def moments(program: Program, degree: int, variables: List[Symbol] = None, context: Context = None) -> Dict[Expr, Expr]:
+    """
+    Returns the expected values E[v^k] of the given variables (all program variables if none are given) for all k from 1
+    to degree. The highest powers get solved first, as their recurrence systems contain most of the lower powers and
+    mixed monomials, which then are taken from the context instead of being solved again.
+    """
+    if context is None:
+        context = Context(program)
+    if variables is None:
+        variables = program.variables
+
+    for k in reversed(range(1, degree + 1)):
+        for v in variables:
+            get_solution(context, (v ** k).as_poly(program.variables))
+    return {v ** k: get_solution(context, (v ** k).as_poly(program.variables))
+            for v in variables for k in range(1, degree + 1)}
 
 
-def get_solution(program: Program, monomial: Poly):
+def get_solution(context: Context, monomial: Poly):
     """
     For a given monomial returns its expected value by first checking if it already has been computed and stored
     """
     log(f"Start get solution, { monomial.as_expr() }", LOG_VERBOSE)
-    global solution_store
     if monomial_is_constant(monomial):
         return monomial.as_expr()
-    if monomial.as_expr() not in solution_store:
-        solution_store[monomial.as_expr()] = compute_solution(program, monomial)
+    if monomial.as_expr() not in context.solution_store:
+        context.solution_store[monomial.as_expr()] = get_cached_solution(context, monomial)
     log(f"End get solution, { monomial.as_expr() }", LOG_VERBOSE)
-    return solution_store[monomial.as_expr()]
+    return context.solution_store[monomial.as_expr()]
 
 
-def compute_solution(program: Program, monomial: Poly):
+def get_cached_solution(context: Context, monomial: Poly):
     """
-    For a given monomial returns its expected value by constructing and solving a recurrence relation
+    For a given monomial returns its expected value from the persistent cache if it is enabled. Otherwise, or if the
+    solution is not cached yet, the solution gets computed.
+    """
+    if not cache_enabled():
+        return compute_solution(context, monomial)
+
+    solution = load_cached_solution(context.program, monomial.as_expr())
+    if solution is None:
+        solution = compute_solution(context, monomial)
+        store_solution(context.program.cache_key, monomial.as_expr(), solution)
+    return solution
+
+
+def load_cached_solution(program: Program, monomial: Expr):
+    """
+    Returns the solution of a monic monomial from the persistent cache or None if the cache is disabled or the
+    solution is not cached
+    """
+    if not cache_enabled():
+        return None
+    if program.cache_key is None:
+        program.cache_key = get_program_key(program)
+    return load_solution(program.cache_key, monomial)
+
+
+@traced("moments", lambda context, monomial: {"monomial": monomial.as_expr()})
+def compute_solution(context: Context, monomial: Poly):
+    """
+    For a given monomial returns its expected value by solving the triangular system of recurrences of all monomials
+    it depends on. The solutions of all these monomials get stored as well.
     """
     log(f"Start compute solution, { monomial.as_expr() }", LOG_VERBOSE)
     if monomial_is_constant(monomial):
@@ -70,17 +132,145 @@ def compute_solution(program: Program, monomial: Poly):
 
     factor = monomial.coeffs()[0]
     monomial = monomial.monic()
-    recurrence = get_recurrence(program, monomial)
+    solutions = solve_recurrence_system(context, monomial)
+    for m, solution in solutions.items():
+        if m != monomial.as_expr():
+            context.solution_store[m] = solution
+            if cache_enabled():
+                store_solution(context.program.cache_key, m, solution)
+    log(f"End compute solution, { monomial.as_expr() }", LOG_ESSENTIAL)
+    return factor * solutions[monomial.as_expr()]
+
+
+def get_recurrence_system(context: Context, monomial: Poly) -> List[Poly]:
+    """
+    Returns all monic monomials which the given monic monomial depends on and which are not solved yet, including the
+    monomial itself. Their recurrences form a triangular system, the monomials are returned in an order such that
+    every monomial only depends on itself and on monomials before it.
+    """
+    order = []
+    done = set()
+    in_progress = set()
+    # explicit stack instead of recursion, such that large systems do not hit the recursion limit
+    stack = [(monomial, None)]
+    while stack:
+        m, dependencies = stack.pop()
+        key = m.as_expr()
+        if dependencies is None:
+            if key in done or key in in_progress:
+                continue
+            if key in context.solution_store:
+                done.add(key)
+                continue
+            cached = load_cached_solution(context.program, key)
+            if cached is not None:
+                context.solution_store[key] = cached
+                done.add(key)
+                continue
+            recurrence = get_recurrence(context, m)
+            dependencies = [d for d in get_monoms(recurrence) if d.as_expr() != key]
+            in_progress.add(key)
+
+        pending = [d for d in dependencies if d.as_expr() not in done]
+        if not pending:
+            in_progress.remove(key)
+            done.add(key)
+            order.append(m)
+            continue
+        if pending[0].as_expr() in in_progress:
+            raise Exception(f"The recurrences of {key} and {pending[0].as_expr()} depend on each other. Terminating.")
+        stack.append((m, pending[1:]))
+        stack.append((pending[0], None))
+
+    return order
+
+
+def get_dependency_levels(context: Context, order: List[Poly]) -> List[List[Poly]]:
+    """
+    Groups monomials given in triangular order into levels, such that every monomial only depends on monomials of
+    earlier levels (or already solved ones). The monomials of a single level are independent of each other.
+    """
+    levels = {}
+    for m in order:
+        dependencies = [d.as_expr() for d in get_monoms(get_recurrence(context, m)) if d.as_expr() != m.as_expr()]
+        levels[m.as_expr()] = max((levels[d] + 1 for d in dependencies if d in levels), default=0)
+
+    result = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for m in order:
+        result[levels[m.as_expr()]].append(m)
+    return result
+
+
+@traced("moments", lambda context, monomial: {"monomial": monomial.as_expr()})
+def solve_recurrence_system(context: Context, monomial: Poly) -> Dict[Expr, Expr]:
+    """
+    Solves the triangular system of recurrences of a monic monomial level by level. The monomials of a level are
+    solved concurrently if more than one solver job is set.
+    """
+    solutions = {}
+    for level in get_dependency_levels(context, get_recurrence_system(context, monomial)):
+        if solver_jobs > 1 and len(level) > 1:
+            solutions.update(solve_monomials_concurrently(context, level, solutions))
+        else:
+            for m in level:
+                solutions[m.as_expr()] = solve_monomial_recurrence(context, m, solutions)
+    return solutions
+
+
+def solve_monomials_concurrently(context: Context, monomials: List[Poly], solutions: Dict[Expr, Expr]):
+    """
+    Solves independent monomials in forked processes, which inherit all solutions computed so far
+    """
+    chunks = [monomials[i::solver_jobs] for i in range(solver_jobs) if monomials[i::solver_jobs]]
+    tasks = [partial(solve_monomials, context, chunk, solutions) for chunk in chunks]
+    # if a process fails, its monomials get solved in this process
+    fallback = lambda i, _: solve_monomials(context, chunks[i], solutions)
+    result = {}
+    for _, solved in run_forked(tasks, fallback):
+        result.update(solved)
+    return result
+
+
+def solve_monomials(context: Context, monomials: List[Poly], solutions: Dict[Expr, Expr]) -> Dict[Expr, Expr]:
+    """
+    Solves some independent monomials, all monomials they depend on have to be solved already
+    """
+    return {m.as_expr(): solve_monomial_recurrence(context, m, solutions) for m in monomials}
+
+
+def solve_monomial_recurrence(context: Context, monomial: Poly, solutions: Dict[Expr, Expr]):
+    """
+    Solves the recurrence of a single monic monomial, all monomials it depends on have to be solved already.
+    The recurrence gets solved in closed form as exponential polynomial if the solutions it depends on are exponential
+    polynomials, otherwise by summation.
+    """
+    n = symbols('n', integer=True, positive=True)
+    recurrence = get_recurrence(context, monomial)
     recurr_coeff = recurrence.coeff_monomial(monomial.as_expr())
     inhom_part = recurrence - (recurr_coeff * monomial)
-    inhom_part_solution = get_inhom_part_solution(program, inhom_part)
-    initial_value = get_expected_initial_value(program, monomial)
-    solution = compute_solution_for_recurrence(recurr_coeff, inhom_part_solution, initial_value)
-    log(f"End compute solution, { monomial.as_expr() }", LOG_ESSENTIAL)
-    return factor * solution
+    initial_value = get_expected_initial_value(context.program, monomial)
+
+    inhom_exppoly = ExpPoly.from_expr(inhom_part.coeff_monomial(1), n)
+    for dependency in get_monoms(inhom_part):
+        key = dependency.as_expr()
+        solution = solutions[key] if key in solutions else context.solution_store[key]
+        solution = ExpPoly.from_expr(solution, n)
+        if inhom_exppoly is None or solution is None:
+            inhom_exppoly = None
+            break
+        inhom_exppoly = inhom_exppoly.add(solution, inhom_part.coeff_monomial(key))
+
+    if inhom_exppoly is not None:
+        solution = solve_recurrence(recurr_coeff, inhom_exppoly, initial_value)
+        if solution is not None:
+            return solution.as_expr(n)
 
+    context.solution_store.update(solutions)
+    inhom_part_solution = get_inhom_part_solution(context, inhom_part)
+    return compute_solution_for_recurrence(recurr_coeff, inhom_part_solution, initial_value)
 
-def get_inhom_part_solution(program: Program, inhom_part: Poly):
+
+def get_inhom_part_solution(context: Context, inhom_part: Poly):
     """
     For a given inhomogenous part of the assignment of a monomial replace the monomials in the inhom part by their
     closed form solutions.
@@ -89,7 +279,7 @@ def get_inhom_part_solution(program: Program, inhom_part: Poly):
     monomials = get_monoms(inhom_part)
     result = inhom_part.coeff_monomial(1)
     for monomial in monomials:
-        solution = get_solution(program, monomial)
+        solution = get_solution(context, monomial)
         monomial = monomial.as_expr()
         result += inhom_part.coeff_monomial(monomial) * solution
     log(f"End get inhom_part_solution, {inhom_part.as_expr()}", LOG_VERBOSE)
@@ -111,11 +301,12 @@ def get_expected_initial_value(program: Program, monomial: Poly):
                 result *= program.initial_values[variable].random_var.compute_moment(power)
             else:
                 # Variable initialized with branches
-                result *= sum([b[1] * (b[0]**power) for b in program.initial_values[variable].branches])
+                result *= program.initial_values[variable].power(power)
     log(f"End get expected initial value, { monomial.as_expr() }", LOG_VERBOSE)
     return result
 
 
+@traced("moments")
 def compute_solution_for_recurrence(recurr_coeff: Expr, inhom_part_solution: Expr, initial_value: Expr):
     """
     Computes the (unique) solution to the recurrence relation:
@@ -126,6 +317,10 @@ def compute_solution_for_recurrence(recurr_coeff: Expr, inhom_part_solution: Exp
     if recurr_coeff.is_zero:
         return expand(inhom_part_solution.xreplace({n: n-1}))
 
+    solution = solve_recurrence_in_closed_form(recurr_coeff, inhom_part_solution, initial_value, n)
+    if solution is not None:
+        return solution
+
     hom_solution = (recurr_coeff ** n) * initial_value
     k = symbols('_k', integer=True, positive=True)
     summand = simplify((recurr_coeff ** k) * inhom_part_solution.xreplace({n: (n-1) - k}))
@@ -136,71 +331,50 @@ def compute_solution_for_recurrence(recurr_coeff: Expr, inhom_part_solution: Exp
     return solution
 
 
-def get_recurrence(program: Program, monomial: Poly):
+def get_recurrence(context: Context, monomial: Poly):
     """
     For a given monomial returns its recurrence representation by first checking if it already
     as been computed and stored
     """
     log(f"Start get recurrence, { monomial.as_expr() }", LOG_VERBOSE)
-    global recurrence_store
     if monomial_is_constant(monomial):
         return monomial
-    if monomial.as_expr() not in recurrence_store:
-        recurrence_store[monomial.as_expr()] = compute_recurrence(program, monomial)
+    if monomial.as_expr() not in context.recurrence_store:
+        context.recurrence_store[monomial.as_expr()] = compute_recurrence(context.program, monomial)
     log(f"End get recurrence, { monomial.as_expr() }", LOG_VERBOSE)
-    return recurrence_store[monomial.as_expr()]
+    return context.recurrence_store[monomial.as_expr()]
 
 
+@traced("moments", lambda program, monomial: {"monomial": monomial.as_expr()})
 def compute_recurrence(program: Program, monomial: Poly):
     """
-    Iteratively splits a monomial on variables which are dependent with respect to the given monomial
+    Iteratively replaces the powers of the variables in a monomial by the expected values of their updates, going
+    through the variables in reverse order. All intermediate polynomials are kept in sparse representation.
     """
     log(f"Start compute recurrence, { monomial.as_expr() }", LOG_VERBOSE)
-    result = monomial.as_expr()
-    split_variables = set()
+    result = monomial.as_expr().as_poly(program.variables)
     for variable, update in reversed(program.updates.items()):
-        if variable not in result.free_symbols:
-            continue
-
-        if update.is_random_var:
-            result = replace_rv_in_polynomial(program, result.as_poly(program.variables), variable).as_expr()
+        index = program.variables.index(variable)
+        degree = max((m[index] for m in result.monoms()), default=0)
+        if degree == 0:
             continue
-
-        split_variables.add(variable)
-        branches = split_expression_on_variable(program, result, variable)
-        log(f"Start combining {len(branches)} branches", LOG_VERBOSE)
-        result = sum([prob * branch for branch, prob in branches])
-        log(f"Mid combining branches", LOG_VERBOSE)
-        result = expand(result)
-        log(f"End combining branches", LOG_VERBOSE)
+        powers = update.poly_powers(program.variables, degree)
+        result = substitute_powers(result, index, powers)
 
     log(f"End compute recurrence, { monomial.as_expr() }", LOG_VERBOSE)
-    return result.as_poly(program.variables)
-
-
-def split_expression_on_variable(program: Program, expression, variable):
-    """
-    For a given expression, splits it with the updates of a given variable.
-    """
-    log(f"Start split expression on variable, { variable }", LOG_VERBOSE)
-    if variable not in expression.free_symbols:
-        return [(expression, sympify(1))]
-
-    branches = []
-    for b, p in program.updates[variable].branches:
-        branches.append((expression.xreplace({variable: b}), p))
-    log(f"End split expression on variable, { variable }", LOG_VERBOSE)
-    return branches
+    return result
 
 
-def replace_rv_in_polynomial(program: Program, polynomial: Poly, rv: Symbol):
+def substitute_powers(polynomial: Poly, index: int, powers: List[Poly]) -> Poly:
     """
-    For a given polynomial return a polynomial such that all powers of a random variable are replaced with their
-    corresponding moments.
+    Replaces every power k of the variable with the given index in the polynomial by powers[k]
     """
-    log(f"Start replace rv in polynomial, { rv }", LOG_VERBOSE)
-    powers = get_powers_of_variable_in_polynomial(rv, polynomial)
-    replacements = {rv ** p: program.updates[rv].random_var.compute_moment(p) for p in powers}
-    polynomial = polynomial.as_expr().xreplace(replacements).as_poly(program.variables)
-    log(f"End replace rvs in polynomial, { rv }", LOG_VERBOSE)
-    return polynomial
+    by_power = {}
+    for monom, coeff in polynomial.terms():
+        rest = monom[:index] + (0,) + monom[index + 1:]
+        by_power.setdefault(monom[index], {})[rest] = coeff
+
+    result = polynomial.zero
+    for k, terms in by_power.items():
+        result += Poly.from_dict(terms, *polynomial.gens, domain=polynomial.domain) * powers[k]
+    return result
@@ -0,0 +1,178 @@
+"""This file is part of MORA
+
+This file contains a representation of exponential polynomials in n, that is sums of terms c * n**k * b**n where
+neither c nor b contain n and k is a non-negative integer. Almost all closed forms and bounds occurring in MORA and
+Amber are of this shape. Having them in this normal form allows to reason about them (e.g. about their growth)
+without expensive symbolic operations.
+"""
+
+from typing import Dict, Tuple
+
+from diofant import Expr, Add, Mul, Integer, binomial, expand, oo, zoo, nan, sympify
+
+Term = Tuple[Expr, int]
+
+
+class ExpPoly:
+    """
+    An exponential polynomial in n. The terms are stored in a dictionary mapping (b, k) to c for every term
+    c * n**k * b**n.
+    """
+
+    def __init__(self, terms: Dict[Term, Expr] = None):
+        self.terms: Dict[Term, Expr] = {}
+        if terms is not None:
+            for (base, power), coeff in terms.items():
+                self.add_term(base, power, coeff)
+
+    def add_term(self, base: Expr, power: int, coeff: Expr):
+        """
+        Adds c * n**k * b**n to the exponential polynomial
+        """
+        key = (sympify(base), int(power))
+        coeff = self.terms[key] + coeff if key in self.terms else sympify(coeff)
+        if coeff.is_zero:
+            self.terms.pop(key, None)
+        else:
+            self.terms[key] = coeff
+
+    def is_zero(self) -> bool:
+        return not self.terms
+
+    def add(self, other: "ExpPoly", factor: Expr = Integer(1)) -> "ExpPoly":
+        """
+        Returns the sum of this exponential polynomial and factor times another one
+        """
+        result = ExpPoly(self.terms)
+        for (base, power), coeff in other.terms.items():
+            result.add_term(base, power, factor * coeff)
+        return result
+
+    def shift(self) -> "ExpPoly":
+        """
+        Returns the exponential polynomial with n replaced by n - 1. All bases have to be non-zero.
+        """
+        result = ExpPoly()
+        for (base, power), coeff in self.terms.items():
+            for j in range(power + 1):
+                result.add_term(base, j, coeff * binomial(power, j) * (-1) ** (power - j) / base)
+        return result
+
+    def grouped_by_base(self) -> Dict[Expr, Dict[int, Expr]]:
+        """
+        Returns the polynomial coefficients belonging to every base
+        """
+        groups = {}
+        for (base, power), coeff in self.terms.items():
+            groups.setdefault(base, {})[power] = coeff
+        return groups
+
+    def as_expr(self, n: Expr) -> Expr:
+        return Add(*[coeff * n**power * base**n for (base, power), coeff in self.terms.items()])
+
+    @staticmethod
+    def from_expr(expr: Expr, n: Expr):
+        """
+        Returns the exponential polynomial representing the given expression or None if the expression
+        is not an exponential polynomial in n.
+        """
+        expr = sympify(expr)
+        if expr.has(oo, -oo, zoo, nan):
+            return None
+
+        result = ExpPoly()
+        if n not in expr.free_symbols:
+            result.add_term(Integer(1), 0, expr)
+            return result
+
+        for term in Add.make_args(expand(expr)):
+            base, power, coeff = Integer(1), 0, Integer(1)
+            for factor in Mul.make_args(term):
+                if n not in factor.free_symbols:
+                    coeff *= factor
+                    continue
+
+                b, e = factor.as_base_exp()
+                if b == n and e.is_Integer and e >= 0:
+                    power += int(e)
+                elif n not in b.free_symbols:
+                    # b**(a*n + c) = b**c * (b**a)**n
+                    c, an = e.as_independent(n, as_Add=True)
+                    a = an / n
+                    if n in a.free_symbols:
+                        return None
+                    base *= b ** a
+                    coeff *= b ** c
+                else:
+                    return None
+
+            result.add_term(base, power, coeff)
+
+        return result
+
+
+def solve_recurrence(coefficient: Expr, inhom_part: ExpPoly, initial_value: Expr):
+    """
+    Returns the solution of f(0) = initial_value; f(n+1) = coefficient * f(n) + inhom_part as exponential polynomial.
+    The particular solution for every base of the inhomogeneous part is found with undetermined coefficients.
+    As for symbolic summation, a symbolic base is assumed to differ from the coefficient unless they are equal.
+    Returns None if a base is 0.
+    """
+    coefficient = sympify(coefficient)
+    if any(base.is_zero for base, _ in inhom_part.terms.keys()):
+        return None
+    if coefficient.is_zero:
+        return inhom_part.shift()
+
+    particular = ExpPoly()
+    for base, polynomial in inhom_part.grouped_by_base().items():
+        degree = max(polynomial.keys())
+        p = [polynomial.get(j, Integer(0)) for j in range(degree + 1)]
+        if expand(base - coefficient) == 0:
+            q = __resonant_coefficients(base, p)
+        else:
+            q = __non_resonant_coefficients(base, coefficient, p)
+        for j, q_j in enumerate(q):
+            particular.add_term(base, j, q_j)
+
+    # the homogeneous part c^n * C is chosen such that the initial value is met
+    at_zero = sum((coeff for (_, power), coeff in particular.terms.items() if power == 0), Integer(0))
+    return particular.add(ExpPoly({(coefficient, 0): initial_value - at_zero}))
+
+
+def solve_recurrence_in_closed_form(coefficient: Expr, inhom_part: Expr, initial_value: Expr, n: Expr):
+    """
+    The same as solve_recurrence for an inhomogeneous part given as expression. Returns the solution as expression or
+    None if the inhomogeneous part is not an exponential polynomial.
+    """
+    inhom_exppoly = ExpPoly.from_expr(inhom_part, n)
+    if inhom_exppoly is None:
+        return None
+    solution = solve_recurrence(coefficient, inhom_exppoly, initial_value)
+    if solution is None:
+        return None
+    return solution.as_expr(n)
+
+
+def __non_resonant_coefficients(base: Expr, coefficient: Expr, p: [Expr]) -> [Expr]:
+    """
+    Returns the coefficients q of q(n) * base**n such that base * q(n+1) - coefficient * q(n) = p(n)
+    """
+    degree = len(p) - 1
+    q = [Integer(0)] * (degree + 1)
+    for j in range(degree, -1, -1):
+        higher = sum((binomial(i, j) * q[i] for i in range(j + 1, degree + 1)), Integer(0))
+        q[j] = (p[j] - base * higher) / (base - coefficient)
+    return q
+
+
+def __resonant_coefficients(base: Expr, p: [Expr]) -> [Expr]:
+    """
+    Returns the coefficients q of q(n) * base**n such that base * (q(n+1) - q(n)) = p(n) and q(0) = 0
+    """
+    degree = len(p) - 1
+    q = [Integer(0)] * (degree + 2)
+    for j in range(degree, -1, -1):
+        higher = sum((binomial(i, j) * q[i] for i in range(j + 2, degree + 2)), Integer(0))
+        q[j + 1] = (p[j] / base - higher) / (j + 1)
+    return q
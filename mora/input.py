@@ -10,9 +10,23 @@ from .core import Program
 import os
 from lark import Lark, Visitor
 
-GRAMMAR_FILE_PATH = "mora/prob_solvable.lark"
+GRAMMAR_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prob_solvable.lark")
 LOOP_GUARD_VAR: str = "loop_guard"
 
+# The parser gets built only once per process, as building it is more expensive than parsing a single program
+__lark_parser = None
+
+
+def get_lark_parser() -> Lark:
+    """
+    Lazily builds the parser for the grammar of prob-solvable loops and returns it
+    """
+    global __lark_parser
+    if __lark_parser is None:
+        with open(GRAMMAR_FILE_PATH) as grammar_file:
+            __lark_parser = Lark(grammar_file)
+    return __lark_parser
+
 
 class InputParser:
     def __init__(self):
@@ -29,11 +43,15 @@ class InputParser:
             self.__program.name = "from_text"
             #raise Exception(f"File {source} not found")
 
-    def parse_source(self):
-        with open(GRAMMAR_FILE_PATH) as grammar_file:
-            lark_parser = Lark(grammar_file)
+    def set_source_text(self, source: str, name: str = "from_text"):
+        """
+        Sets the text of the program, without ever interpreting it as the path of a file
+        """
+        self.__program.source = source
+        self.__program.name = name
 
-        tree = lark_parser.parse(self.__program.source)
+    def parse_source(self):
+        tree = get_lark_parser().parse(self.__program.source)
         visitor = UpdateProgramVisitor(self.__program)
         visitor.visit(tree)
         self.__set_unknown_initializations()
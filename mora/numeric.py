@@ -0,0 +1,137 @@
+"""
+This module evaluates expected values of monomials numerically for concrete iteration counts. Instead of evaluating the
+closed-form solutions pointwise, the triangular system of recurrences of a monomial gets lowered to a matrix A and
+a vector of initial values s_0, such that s_{n+1} = A s_n. The system is then iterated with NumPy, either with floats
+or exactly with rational numbers (object arrays of Fractions). Large gaps between consecutive iteration counts are
+bridged with matrix powers.
+"""
+
+from fractions import Fraction
+from math import log2
+from typing import Dict, Iterable, List
+
+from diofant import Expr, Poly, Symbol, sympify
+from mora.core import Program, Context, get_recurrence, get_expected_initial_value
+from mora.trace import traced
+from mora.utils import get_monoms, monomial_is_constant
+
+
+def evaluate_moments(program: Program, monomials: List[Expr], n_values: Iterable[int], exact: bool = False,
+                     values: Dict[Symbol, Expr] = None, context: Context = None):
+    """
+    Returns a dictionary mapping every given monomial to a NumPy array of its expected values at the given iteration
+    counts. With 'exact' the values are Fractions, otherwise floats. Symbolic parameters and unknown initial values
+    need to be given concrete numbers in 'values'.
+    """
+    # NumPy is only imported here, as loading it is not needed for deciding termination
+    import numpy
+
+    if context is None:
+        context = Context(program)
+    values = {} if values is None else {sympify(k): sympify(v) for k, v in values.items()}
+    n_values = [int(n) for n in n_values]
+    if any(n < 0 for n in n_values):
+        raise ValueError("The iteration counts have to be non-negative")
+
+    goals = [sympify(m).as_poly(program.variables) for m in monomials]
+    monic_goals = [g.monic() for g in goals if not monomial_is_constant(g)]
+    closure = get_monomial_closure(context, monic_goals)
+    matrix, state, index = lower_to_matrix(context, closure, values, exact)
+
+    order = sorted(range(len(n_values)), key=lambda i: n_values[i])
+    evaluated = numpy.empty((len(n_values), len(state)), dtype=object if exact else float)
+    current_n = 0
+    for i in order:
+        state = __advance(matrix, state, n_values[i] - current_n)
+        current_n = n_values[i]
+        evaluated[i] = state
+
+    result = {}
+    for monomial, goal in zip(monomials, goals):
+        factor = __to_number(goal.coeffs()[0] if not goal.is_zero else sympify(0), values, exact)
+        if monomial_is_constant(goal):
+            column = numpy.full(len(n_values), factor, dtype=object if exact else float)
+        else:
+            column = evaluated[:, index[goal.monic().as_expr()]] * factor
+        result[sympify(monomial)] = column
+    return result
+
+
+def get_monomial_closure(context: Context, monomials: List[Poly]) -> List[Poly]:
+    """
+    Returns all monic monomials which the given monic monomials transitively depend on, including the monomials
+    themselves. In contrast to the recurrence system used for closed forms, already solved monomials are not skipped.
+    """
+    closure = []
+    seen = set()
+    stack = list(monomials)
+    while stack:
+        m = stack.pop()
+        if m.as_expr() in seen:
+            continue
+        seen.add(m.as_expr())
+        closure.append(m)
+        stack.extend(d for d in get_monoms(get_recurrence(context, m)) if d.as_expr() not in seen)
+    return closure
+
+
+@traced("numeric", lambda context, monomials, values, exact: {"monomials": len(monomials)})
+def lower_to_matrix(context: Context, monomials: List[Poly], values: Dict[Symbol, Expr], exact: bool):
+    """
+    Lowers the recurrences of the given closed set of monic monomials to a matrix A and the vector of their initial
+    values s_0, such that s_{n+1} = A s_n. The last entry of the state is the constant 1, which carries the constant
+    parts of the recurrences. Also returns the index of every monomial in the state.
+    """
+    import numpy
+
+    dtype = object if exact else float
+    size = len(monomials) + 1
+    index = {m.as_expr(): i for i, m in enumerate(monomials)}
+    matrix = numpy.zeros((size, size), dtype=dtype)
+    state = numpy.zeros(size, dtype=dtype)
+    if exact:
+        matrix[:] = Fraction(0)
+        state[:] = Fraction(0)
+
+    for m in monomials:
+        row = index[m.as_expr()]
+        recurrence = get_recurrence(context, m)
+        matrix[row, size - 1] = __to_number(recurrence.coeff_monomial(1), values, exact)
+        for dependency in get_monoms(recurrence):
+            key = dependency.as_expr()
+            matrix[row, index[key]] = __to_number(recurrence.coeff_monomial(key), values, exact)
+        state[row] = __to_number(get_expected_initial_value(context.program, m), values, exact)
+
+    matrix[size - 1, size - 1] = __to_number(sympify(1), values, exact)
+    state[size - 1] = __to_number(sympify(1), values, exact)
+    return matrix, state, index
+
+
+def __advance(matrix, state, steps: int):
+    """
+    Applies the matrix the given number of times to the state. Single steps are cheaper for small gaps, for large
+    gaps the matrix gets raised to the power of the gap by repeated squaring.
+    """
+    import numpy
+
+    size = len(state)
+    if steps > size * log2(steps + 1):
+        return numpy.linalg.matrix_power(matrix, steps).dot(state)
+    for _ in range(steps):
+        state = matrix.dot(state)
+    return state
+
+
+def __to_number(expression: Expr, values: Dict[Symbol, Expr], exact: bool):
+    """
+    Converts a constant expression to a Fraction or float, after replacing the symbols given in 'values'
+    """
+    expression = sympify(expression).xreplace(values)
+    if not expression.is_number:
+        # Either symbolic parameters or unknown initial values like x(0) are left
+        raise ValueError(f"The expression {expression} has no concrete value, the values of its symbols are missing")
+    if exact:
+        if not expression.is_Rational:
+            raise ValueError(f"The expression {expression} is not rational and cannot be evaluated exactly")
+        return Fraction(int(expression.numerator), int(expression.denominator))
+    return float(expression)
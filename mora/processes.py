@@ -0,0 +1,109 @@
+"""This file is part of MORA
+
+This file contains a helper running tasks in forked processes. The processes inherit the whole state of the parent
+(e.g. the stores of an analysis context), so tasks do not need to be pickled, only their results get sent back.
+"""
+
+import os
+import signal
+import time
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from typing import Any, Callable, List
+
+# The exit code of a process whose task ran out of memory without handling it
+MEMORY_ERROR_EXIT_CODE = 3
+
+
+def run_forked(tasks: List[Callable[[], Any]], fallback: Callable[[int, int], Any] = None, jobs: int = None,
+               timeout: float = None, on_timeout: Callable[[int], Any] = None, own_process_group: bool = False):
+    """
+    Runs every task in its own forked process, with at most 'jobs' processes at the same time (all at once if not
+    given). Yields pairs of the index of a task and its result in the order in which the tasks finish.
+    If a process dies without a result, the result is fallback(index, exitcode), computed in this process (None
+    without fallback). The exit code is MEMORY_ERROR_EXIT_CODE if the task raised a MemoryError and the negative number
+    of the signal if the process was killed by one. A process running for longer than 'timeout' seconds gets killed
+    and its result is on_timeout(index).
+    With 'own_process_group' every process gets its own process group, which gets killed as a whole, such that also
+    the processes it started die. All processes still running are killed as soon as the generator is closed.
+    """
+    mp = get_context("fork")
+    pending = list(reversed(range(len(tasks))))
+    running = {}
+    try:
+        while pending or running:
+            while pending and (jobs is None or len(running) < jobs):
+                index = pending.pop()
+                receiver, sender = mp.Pipe(duplex=False)
+                process = mp.Process(target=__run_task, args=(sender, tasks[index], own_process_group))
+                process.start()
+                if own_process_group:
+                    __set_own_process_group(process)
+                sender.close()
+                deadline = time.monotonic() + timeout if timeout else None
+                running[receiver] = (process, index, deadline)
+
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for receiver in wait(list(running.keys()), wait_time):
+                process, index, _ = running.pop(receiver)
+                try:
+                    result = receiver.recv()
+                    failed = False
+                except EOFError:
+                    result, failed = None, True
+                receiver.close()
+                process.join()
+                if failed and fallback is not None:
+                    result = fallback(index, process.exitcode)
+                yield index, result
+
+            now = time.monotonic()
+            for receiver, (process, index, deadline) in list(running.items()):
+                if deadline is not None and deadline <= now:
+                    del running[receiver]
+                    __kill(process, own_process_group)
+                    receiver.close()
+                    yield index, on_timeout(index) if on_timeout is not None else None
+    finally:
+        for receiver, (process, _, _) in running.items():
+            __kill(process, own_process_group)
+            receiver.close()
+
+
+def __run_task(connection, task: Callable[[], Any], own_process_group: bool):
+    """
+    The entry point of a forked process
+    """
+    if own_process_group:
+        os.setpgid(0, 0)
+    try:
+        connection.send(task())
+    except MemoryError:
+        os._exit(MEMORY_ERROR_EXIT_CODE)
+    connection.close()
+
+
+def __set_own_process_group(process):
+    """
+    Moves a process into its own process group. This happens in the parent and in the process itself,
+    such that it is done no matter which of the two runs first.
+    """
+    try:
+        os.setpgid(process.pid, process.pid)
+    except OSError:
+        pass
+
+
+def __kill(process, own_process_group: bool):
+    """
+    Kills a process, or its whole process group such that processes started by it die as well
+    """
+    if own_process_group:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            process.kill()
+    else:
+        process.kill()
+    process.join()
@@ -0,0 +1,105 @@
+"""This file is part of MORA
+
+This file contains a lightweight tracing layer. When tracing is enabled, nested spans (e.g. per monomial or per
+proof rule) get recorded and can be exported in the Chrome trace format, which can be viewed with chrome://tracing
+or https://ui.perfetto.dev. When tracing is disabled, spans only cost a single check.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+tracing_enabled = False
+trace_events = []
+
+
+def enable_tracing():
+    global tracing_enabled
+    tracing_enabled = True
+
+
+def get_trace_events() -> [dict]:
+    return trace_events
+
+
+def add_trace_events(events: [dict]):
+    """
+    Adds events recorded somewhere else, e.g. in a worker process, to the trace
+    """
+    trace_events.extend(events)
+
+
+def clear_trace_events():
+    global trace_events
+    trace_events = []
+
+
+def __now() -> float:
+    """
+    Returns the current time in microseconds, the unit of the Chrome trace format
+    """
+    return time.perf_counter_ns() / 1000
+
+
+@contextmanager
+def span(name: str, category: str = "", args: dict = None):
+    """
+    Records the time spent within the context as a span with the given name
+    """
+    if not tracing_enabled:
+        yield
+        return
+
+    start = __now()
+    try:
+        yield
+    finally:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start,
+            "dur": __now() - start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        trace_events.append(event)
+
+
+def traced(category: str, get_args=None):
+    """
+    Decorator recording every call of the decorated function as a span. The optional function 'get_args' receives
+    the arguments of the call and returns a dictionary of values which are stored with the span.
+    """
+    def decorator(function):
+        name = function.__name__.strip("_")
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not tracing_enabled:
+                return function(*args, **kwargs)
+            with span(name, category, get_args(*args, **kwargs) if get_args else None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def name_process(name: str):
+    """
+    Gives the current process a name which is shown in the trace viewer
+    """
+    if tracing_enabled:
+        trace_events.append({"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": name}})
+
+
+def write_trace(path: str):
+    """
+    Writes all recorded events to a file in the Chrome trace format
+    """
+    with open(path, "w") as file:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, file)
@@ -1,9 +1,6 @@
 from typing import Iterable
 
-from diofant import sympify, Rational, Poly, prod, Symbol, symbols, oo, Max, Min, polylog, factorial, product, gamma
-from diofant.stats import Laplace, Binomial, Hypergeometric, E
-from scipy.stats import norm
-from math import sqrt
+from diofant import sympify, Rational, Poly, prod, Symbol, symbols, oo, Max, Min, gamma, binomial, cancel, expand
 import re
 
 LOG_NOTHING = 0
@@ -20,6 +17,10 @@ class Update:
         self.random_var = random_var
         self.var = var
         self.is_probabilistic = True
+        # E[update^k] for k = 0, 1, ..., filled on demand
+        self.__powers = []
+        # E[update^k] as polynomials, filled on demand for every tuple of generators
+        self.__poly_powers = {}
 
         if update_string is None:
             return
@@ -59,7 +60,40 @@ class Update:
             return term.subs({self.var**pow: self.power(pow)})
 
     def power(self, k):
-        return sum(prob * (exp ** k) for exp, prob in self.branches)
+        return self.powers(k)[k]
+
+    def powers(self, degree):
+        """
+        Returns the expected values of the powers 0 to degree of the update. The table is memoized and only the
+        missing powers get computed.
+        """
+        while len(self.__powers) <= degree:
+            k = len(self.__powers)
+            self.__powers.append(sum(prob * (exp ** k) for exp, prob in self.branches))
+        return self.__powers[:degree + 1]
+
+    def poly_powers(self, gens, degree):
+        """
+        The same as powers, but with the expected values as polynomials in the given generators. The table is memoized
+        for every tuple of generators and only the missing powers get computed. For updates with branches the powers
+        of the branch polynomials get built up by successive multiplication.
+        """
+        gens = tuple(gens)
+        if self.is_random_var:
+            table = self.__poly_powers.setdefault(gens, [])
+            moments = self.random_var.moments(degree)
+            while len(table) <= degree:
+                table.append(sympify(moments[len(table)]).as_poly(*gens))
+            return table[:degree + 1]
+
+        if gens not in self.__poly_powers:
+            branches = [(sympify(b).as_poly(*gens), p) for b, p in self.branches]
+            self.__poly_powers[gens] = (branches, [b.one for b, _ in branches], [sympify(1).as_poly(*gens)])
+        branches, branch_powers, table = self.__poly_powers[gens]
+        while len(table) <= degree:
+            branch_powers[:] = [power * b for power, (b, _) in zip(branch_powers, branches)]
+            table.append(sum((power * p for power, (_, p) in zip(branch_powers, branches)), branches[0][0].zero))
+        return table[:degree + 1]
 
 
 class RandomVar:
@@ -67,6 +101,8 @@ class RandomVar:
         self.distribution = distribution
         self.parameters = parameters
         self.var_name = var_name
+        # The moments E[X^k] for k = 0, 1, ..., filled on demand
+        self.__moments = []
 
     def get_support(self, k=1):
         if self.distribution == 'bernoulli':
@@ -110,6 +146,23 @@ class RandomVar:
             return interval_to_power(Max(0, n + K - N), Min(n, K), k)
 
     def compute_moment(self, k):
+        return self.moments(k)[k]
+
+    def moments(self, degree):
+        """
+        Returns the moments 0 to degree of the random variable. The table is memoized and only the missing moments
+        get computed.
+        """
+        while len(self.__moments) <= degree:
+            self.__moments.append(self.__compute_moment(len(self.__moments)))
+        return self.__moments[:degree + 1]
+
+    def __compute_moment(self, k):
+        """
+        Computes the k-th moment exactly. The moments 0 to k-1 are already in the table, such that most distributions
+        get their moments from a recurrence over the previous ones.
+        """
+        previous = self.__moments
         if self.distribution == 'finite':
             return sum([p * (b ** k) for b, p in self.parameters])
 
@@ -119,45 +172,39 @@ class RandomVar:
 
         if self.distribution == 'gauss' or self.distribution == 'normal':
             mu, sigma_squared = self.parameters
-            # For low moments avoid scipy.stats.moments as it does not support
-            # parametric parameters. In the future get all moments directly,
-            # using the following properties:
-            # https://math.stackexchange.com/questions/1945448/methods-for-finding-raw-moments-of-the-normal-distribution
+            # E[X^k] = mu * E[X^(k-1)] + (k-1) * sigma^2 * E[X^(k-2)]
             if k == 0:
-                return 1
-            elif k == 1:
-                return mu
-            elif k == 2:
-                return mu**2 + sigma_squared
-            elif k == 3:
-                return mu*(mu**2 + 3*sigma_squared)
-            elif k == 4:
-                return mu**4 + 6*mu**2*sigma_squared + 3*sigma_squared**2
-            moment = norm(loc=mu, scale=sqrt(sigma_squared)).moment(k)
-            return Rational(moment)
+                return sympify(1)
+            if k == 1:
+                return sympify(mu)
+            return expand(mu * previous[k-1] + (k-1) * sigma_squared * previous[k-2])
 
         if self.distribution == 'bernoulli':
-            return sympify(self.parameters[0])
+            return sympify(1) if k == 0 else sympify(self.parameters[0])
 
         if self.distribution == 'geometric':
+            # The number of trials up to and including the first success, i.e. the support starts at 1 as in
+            # get_support and E[X] = 1/p. (Before, the moments p*polylog(-k, 1-p) were the ones of the number of
+            # failures, with support starting at 0.)
+            # X = 1 with probability p and X = 1 + X' otherwise, hence E[X^k] = 1 + q/p * sum_{j<k} C(k,j) E[X^j]
             p = sympify(self.parameters[0])
-            return p*polylog(-k, 1-p)
+            if k == 0:
+                return sympify(1)
+            return cancel(1 + (1 - p) / p * sum(binomial(k, j) * previous[j] for j in range(k)))
 
         if self.distribution == 'exponential':
             lambd = sympify(self.parameters[0])
-            return factorial(k) / (lambd ** k)
+            return sympify(1) if k == 0 else previous[k-1] * k / lambd
 
         if self.distribution == 'beta':
             alpha, beta = self.parameters
             alpha = sympify(alpha)
             beta = sympify(beta)
-            r = symbols('r')
-            return product((alpha + r) / (alpha + beta + r), (r, 0, k-1))
+            return sympify(1) if k == 0 else previous[k-1] * (alpha + k - 1) / (alpha + beta + k - 1)
 
         if self.distribution == 'chi-squared':
             n = sympify(self.parameters[0])
-            i = symbols('i')
-            return product(n + 2*i, (i, 0, k - 1))
+            return sympify(1) if k == 0 else expand(previous[k-1] * (n + 2*(k - 1)))
 
         if self.distribution == 'rayleigh':
             s = sympify(self.parameters[0])
@@ -167,26 +214,60 @@ class RandomVar:
             return sympify(f"{self.var_name}(0)^{k}")
 
         if self.distribution == 'laplace':
+            # From the moment generating function e^(mu t) / (1 - b^2 t^2) follows E[X^k] = mu^k + b^2 k (k-1) E[X^(k-2)]
             mu, b = self.parameters
             mu = sympify(mu)
             b = sympify(b)
-            x = Laplace("x", mu, b)
-            return E(x**k)
+            if k < 2:
+                return mu ** k
+            return expand(mu ** k + b**2 * k * (k - 1) * previous[k-2])
 
         if self.distribution == 'binomial':
+            # The j-th factorial moment is n (n-1) ... (n-j+1) p^j
             n, p = self.parameters
             n = sympify(n)
             p = sympify(p)
-            x = Binomial("x", n, p)
-            return E(x**k)
+            return moment_from_factorial_moments(k, lambda j: ((n - j + 1) * p, 1))
 
         if self.distribution == 'hypergeometric':
+            # The j-th factorial moment is K^(j) n^(j) / N^(j) with ^(j) denoting the falling factorial
             N, K, n = self.parameters
             N = sympify(N)
             K = sympify(K)
             n = sympify(n)
-            x = Hypergeometric("x", N, K, n)
-            return E(x**k)
+            return moment_from_factorial_moments(k, lambda j: ((K - j + 1) * (n - j + 1), N - j + 1))
+
+
+# The rows of the Stirling numbers of the second kind computed so far
+__stirling_rows = [[1]]
+
+
+def stirling_numbers(k):
+    """
+    Returns the Stirling numbers of the second kind S(k, 0), ..., S(k, k)
+    """
+    while len(__stirling_rows) <= k:
+        row = __stirling_rows[-1]
+        __stirling_rows.append([0] + [j * (row[j] if j < len(row) else 0) + row[j-1] for j in range(1, len(row) + 1)])
+    return __stirling_rows[k]
+
+
+def moment_from_factorial_moments(k, factor):
+    """
+    Returns the k-th raw moment sum_j S(k,j) * F_j of the factorial moments F_0 = 1 and F_j = F_(j-1) * num / den where
+    factor(j) returns the pair (num, den)
+    """
+    result = sympify(0)
+    factorial_moment = sympify(1)
+    for j, stirling in enumerate(stirling_numbers(k)):
+        if j > 0:
+            numerator, denominator = map(sympify, factor(j))
+            # Once a factorial moment vanishes, all higher ones vanish as well
+            if factorial_moment.is_zero or numerator.is_zero:
+                break
+            factorial_moment = factorial_moment * numerator / denominator
+        result += stirling * factorial_moment
+    return expand(result)
 
 
 def EV(expression):
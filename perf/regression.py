@@ -0,0 +1,191 @@
+"""This file is part of Amber
+
+This runnable script is a performance regression suite. It runs Amber several times on the benchmarks of the given
+categories and records the median and the spread of the computation time for every benchmark. The results can either
+be written as a baseline or compared against a previously written baseline. Run it from the root of the repository:
+
+python -m perf.regression --output baseline.json
+python -m perf.regression --compare baseline.json --threshold 0.25
+"""
+
+import glob
+import json
+import os
+import statistics
+import sys
+from argparse import ArgumentParser
+
+from mora.utils import set_log_level as set_mora_log_level, LOG_NOTHING as MORA_LOG_NOTHING
+from src.runner import run_benchmarks, Status
+from src.utils import set_log_level, LOG_NOTHING
+
+DEFAULT_CATEGORIES = ["past", "ast", "non-ast", "rvs", "symb", "paper*"]
+
+parser = ArgumentParser(description="Run Amber's performance regression suite")
+
+parser.add_argument(
+    "--categories",
+    dest="categories",
+    type=str,
+    nargs="+",
+    default=DEFAULT_CATEGORIES,
+    help="The benchmark categories (directories or files within 'benchmarks/') to run"
+)
+
+parser.add_argument(
+    "--repetitions",
+    dest="repetitions",
+    type=int,
+    default=3,
+    help="How often every benchmark gets run"
+)
+
+parser.add_argument(
+    "--jobs",
+    dest="jobs",
+    type=int,
+    default=1,
+    help="The number of benchmarks running in parallel. Note that parallel runs can influence each other's timings"
+)
+
+parser.add_argument(
+    "--timeout",
+    dest="timeout",
+    type=float,
+    default=600,
+    help="The number of seconds after which a single run gets aborted"
+)
+
+parser.add_argument(
+    "--output",
+    dest="output",
+    type=str,
+    default=None,
+    help="A file to which the measurements get written as JSON, e.g. to be used as a baseline"
+)
+
+parser.add_argument(
+    "--compare",
+    dest="compare",
+    type=str,
+    default=None,
+    help="A baseline file the measurements get compared against"
+)
+
+parser.add_argument(
+    "--threshold",
+    dest="threshold",
+    type=float,
+    default=0.25,
+    help="The relative slowdown of the median above which a benchmark is flagged as a regression"
+)
+
+parser.add_argument(
+    "--min-difference",
+    dest="min_difference",
+    type=float,
+    default=0.05,
+    help="Slowdowns of less than this number of seconds are considered noise and never flagged"
+)
+
+
+def get_benchmarks(categories: [str]) -> [str]:
+    """
+    Returns all benchmark files of the given categories
+    """
+    benchmarks = []
+    for category in categories:
+        for path in sorted(glob.glob(os.path.join("benchmarks", category))):
+            if os.path.isdir(path):
+                benchmarks += sorted(p for p in glob.glob(os.path.join(path, "*")) if os.path.isfile(p))
+            else:
+                benchmarks.append(path)
+    return benchmarks
+
+
+def measure(benchmarks: [str], repetitions: int, jobs: int, timeout: float) -> dict:
+    """
+    Runs all benchmarks 'repetitions' times and returns the measurements for every benchmark
+    """
+    runs = {b: [] for b in benchmarks}
+    for repetition in range(repetitions):
+        for benchmark, status, data in run_benchmarks(benchmarks, jobs, timeout=timeout, structured=True):
+            runs[benchmark].append(data)
+            seconds = data["timings"]["total"] if "timings" in data else ""
+            print(f"[{repetition + 1}/{repetitions}] {benchmark}: {data['status']} {seconds}", file=sys.stderr)
+
+    return {benchmark: summarize(data) for benchmark, data in runs.items()}
+
+
+def summarize(runs: [dict]) -> dict:
+    """
+    Summarizes the runs of a single benchmark
+    """
+    times = [r["timings"]["total"] for r in runs if r["status"] == str(Status.OK) and "timings" in r]
+    summary = {
+        "status": runs[-1]["status"],
+        "PAST": runs[-1]["PAST"],
+        "AST": runs[-1]["AST"],
+        "runs": len(times),
+    }
+    if times:
+        summary["median"] = round(statistics.median(times), 4)
+        summary["min"] = round(min(times), 4)
+        summary["max"] = round(max(times), 4)
+        summary["stdev"] = round(statistics.stdev(times), 4) if len(times) > 1 else 0.0
+    return summary
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_difference: float) -> [str]:
+    """
+    Compares the current measurements against a baseline and returns a description of every regression
+    """
+    regressions = []
+    for benchmark, now in current.items():
+        if benchmark not in baseline:
+            continue
+        before = baseline[benchmark]
+        if before["PAST"] != now["PAST"] or before["AST"] != now["AST"]:
+            regressions.append(
+                f"{benchmark}: answers changed from PAST={before['PAST']}, AST={before['AST']} "
+                f"to PAST={now['PAST']}, AST={now['AST']}"
+            )
+        if "median" in before and "median" not in now:
+            regressions.append(f"{benchmark}: status changed from {before['status']} to {now['status']}")
+        if "median" in before and "median" in now:
+            difference = now["median"] - before["median"]
+            if difference > min_difference and difference > threshold * before["median"]:
+                regressions.append(
+                    f"{benchmark}: median went from {before['median']}s to {now['median']}s "
+                    f"(+{round(100 * difference / max(before['median'], 0.0001))}%)"
+                )
+    return regressions
+
+
+def main():
+    args = parser.parse_args()
+    set_log_level(LOG_NOTHING)
+    set_mora_log_level(MORA_LOG_NOTHING)
+
+    benchmarks = get_benchmarks(args.categories)
+    measurements = measure(benchmarks, args.repetitions, args.jobs, args.timeout)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(measurements, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, measurements, args.threshold, args.min_difference)
+        for regression in regressions:
+            print(regression)
+        print(f"{len(regressions)} regression(s) in {len(measurements)} benchmark(s)")
+        if regressions:
+            sys.exit(1)
+    else:
+        for benchmark, summary in measurements.items():
+            print(f"{benchmark}: {summary['status']} {summary.get('median', '')}")
+
+
+if __name__ == "__main__":
+    main()
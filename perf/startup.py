@@ -0,0 +1,100 @@
+"""This file is part of Amber
+
+This runnable script measures the startup time of Amber. It tracks how long "amber.py --help" takes and how long it
+takes until the result of a first (small) benchmark is printed. Run it from the root of the repository with:
+
+python -m perf.startup
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+parser = ArgumentParser(description="Measure the startup time of Amber")
+
+parser.add_argument(
+    "--benchmark",
+    dest="benchmark",
+    type=str,
+    default="benchmarks/past/geometric",
+    help="The benchmark used to measure the time to the first result"
+)
+
+parser.add_argument(
+    "--repetitions",
+    dest="repetitions",
+    type=int,
+    default=5,
+    help="How often every measurement gets repeated"
+)
+
+parser.add_argument(
+    "--output",
+    dest="output",
+    type=str,
+    default=None,
+    help="A file to which the measurements get written as JSON"
+)
+
+
+def time_help() -> float:
+    """
+    Returns the number of seconds "amber.py --help" takes
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "amber.py", "--help"], stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def time_to_first_result(benchmark: str) -> float:
+    """
+    Returns the number of seconds it takes until Amber prints the first result for the given benchmark
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "amber.py", "--benchmarks", benchmark],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True
+    )
+    elapsed = None
+    for line in process.stdout:
+        if line.startswith("PAST:") and elapsed is None:
+            elapsed = time.perf_counter() - start
+    process.wait()
+    if elapsed is None:
+        raise Exception(f"Amber did not print a result for {benchmark}")
+    return elapsed
+
+
+def summarize(times: [float]) -> dict:
+    return {
+        "median": round(statistics.median(times), 4),
+        "min": round(min(times), 4),
+        "max": round(max(times), 4),
+    }
+
+
+def main():
+    args = parser.parse_args()
+    help_times = [time_help() for _ in range(args.repetitions)]
+    first_result_times = [time_to_first_result(args.benchmark) for _ in range(args.repetitions)]
+    measurements = {
+        "help": summarize(help_times),
+        "first_result": summarize(first_result_times),
+        "benchmark": args.benchmark,
+        "repetitions": args.repetitions,
+    }
+
+    print(f"amber.py --help:        {measurements['help']['median']}s (median)")
+    print(f"Time to first result:   {measurements['first_result']['median']}s (median)")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(measurements, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
-from .utils import *
+from functools import partial
+
+import mpmath
+from diofant import Expr, Order, Pow, Symbol, exp, expand, lambdify, oo
+from mora.processes import run_forked
+from mora.trace import traced
+
+from .growth import Growth, get_growth
+from .utils import amber_limit, unique_symbol
 from enum import Enum, auto
 
 
@@ -7,6 +15,29 @@ class Direction(Enum):
     NegInf = auto()
 
 
+# The number of processes comparing candidates in get_eventual_bound, if there are many candidates without a growth class
+bound_jobs = 1
+PARALLEL_CANDIDATES_THRESHOLD = 8
+
+
+def set_bound_jobs(jobs: int):
+    global bound_jobs
+    bound_jobs = jobs
+
+
+# If set, candidates which are clearly dominated at a grid of large n get removed, after confirming it with a single
+# symbolic comparison, before comparing the remaining candidates with each other
+numeric_prefilter = False
+PREFILTER_GRID = [2 ** i for i in range(6, 13)]
+PREFILTER_MARGIN = 1000
+PREFILTER_PRECISION = 50
+
+
+def set_numeric_prefilter(enabled: bool):
+    global numeric_prefilter
+    numeric_prefilter = enabled
+
+
 def dominating(fs: [Expr], n: Symbol):
     return get_eventual_bound(fs, n, Direction.PosInf)
 
@@ -20,20 +51,133 @@ def get_eventual_bound(fs: [Expr], n: Symbol, direction: Direction = Direction.P
     Given a list of expressions in n, it returns a single expression which is eventually a bound on all fs.
     Depending on the 'direction' parameter, the bound is either an eventual upper bound or eventual lower bound.
     """
-    result = None
+    fs = list(dict.fromkeys(fs))
+    if direction == Direction.PosInf and oo in fs:
+        return oo
+    if direction == Direction.NegInf and -oo in fs:
+        return -oo
+
+    # Candidates with a growth class can be compared without computing any limits, so only the best of them has to
+    # be compared with the remaining candidates
+    best_with_growth = None
+    candidates = []
     for f in fs:
-        if result is None:
-            result = f
-        if direction == Direction.PosInf and result == oo:
-            return result
-        if direction == Direction.NegInf and result == -oo:
-            return result
-        else:
-            result = result if is_dominating_or_same(result, f, n, direction) else f
+        growth = get_growth(f, n)
+        if growth is None:
+            candidates.append(f)
+        elif best_with_growth is None or not is_dominating_or_same_by_growth(best_with_growth[1], growth, direction):
+            best_with_growth = (f, growth)
+
+    candidates = __without_constant_multiples(candidates, n)
+    if best_with_growth is not None:
+        candidates.insert(0, best_with_growth[0])
+    if numeric_prefilter and len(candidates) > 2:
+        candidates = __prune_numerically(candidates, n, direction, keep_first=best_with_growth is not None)
+
+    if bound_jobs > 1 and len(candidates) >= PARALLEL_CANDIDATES_THRESHOLD:
+        result = __get_best_candidate_concurrently(candidates, n, direction)
+    else:
+        result = __get_best_candidate(candidates, n, direction)
 
     return simplify_asymptotically(result, n)
 
 
+def __without_constant_multiples(fs: [Expr], n: Symbol) -> [Expr]:
+    """
+    Removes all expressions which are equal to a previous expression up to a positive constant factor
+    """
+    result = []
+    for f in fs:
+        if not any(__is_positive_constant(f / g, n) for g in result):
+            result.append(f)
+    return result
+
+
+def __prune_numerically(fs: [Expr], n: Symbol, direction: Direction, keep_first: bool = False) -> [Expr]:
+    """
+    Evaluates all candidates at a grid of large n, with all constants set to 1, and removes every candidate which is
+    clearly dominated by another one at all points of the grid. The grid only suggests which candidates to remove, every
+    removal still gets confirmed symbolically, as a candidate can overtake another one after the grid.
+    Candidates which cannot be evaluated are always kept, and so is the first one if 'keep_first' is set.
+    """
+    values = [__evaluate_on_grid(f, n) for f in fs]
+    if direction is Direction.NegInf:
+        values = [None if vs is None else [-v for v in vs] for vs in values]
+
+    result = []
+    for i, f in enumerate(fs):
+        dominated = not (keep_first and i == 0) and values[i] is not None and any(
+            values[j] is not None and __is_clearly_dominated(values[i], values[j])
+            and is_dominating_or_same(fs[j], f, n, direction)
+            for j in range(len(fs)) if j != i
+        )
+        if not dominated:
+            result.append(f)
+    return result
+
+
+def __evaluate_on_grid(f: Expr, n: Symbol):
+    others = f.free_symbols - {n}
+    if not all(s.is_positive for s in others):
+        return None
+    # Setting constants to 1 only keeps the growth of f if they are factors, e.g. (3 - c)**n decays for c > 2
+    if any(p.free_symbols - {n} for p in f.atoms(Pow, exp)):
+        return None
+    try:
+        function = lambdify(n, f.xreplace({s: 1 for s in others}), "mpmath")
+        with mpmath.workdps(PREFILTER_PRECISION):
+            values = [function(mpmath.mpf(x)) for x in PREFILTER_GRID]
+    except Exception:
+        return None
+    if not all(isinstance(v, mpmath.mpf) and mpmath.isfinite(v) for v in values):
+        return None
+    return values
+
+
+def __is_clearly_dominated(values_f, values_g) -> bool:
+    """
+    Returns true iff f and g are positive and g exceeds f by a growing factor of at least PREFILTER_MARGIN at every
+    point. A non-positive f is never clearly dominated, as it can still eventually grow faster than g.
+    """
+    factors = []
+    for f, g in zip(values_f, values_g):
+        if f <= 0 or g <= 0:
+            return False
+        factors.append(g / f)
+    return factors[0] >= PREFILTER_MARGIN and all(f1 <= f2 for f1, f2 in zip(factors, factors[1:]))
+
+
+def __is_positive_constant(expression: Expr, n: Symbol) -> bool:
+    return n not in expression.free_symbols and expression.is_positive is True
+
+
+def __get_best_candidate(fs: [Expr], n: Symbol, direction: Direction) -> Expr:
+    """
+    Returns the candidate which eventually dominates all others by comparing the candidates one after another
+    """
+    result = fs[0]
+    for f in fs[1:]:
+        result = result if is_dominating_or_same(result, f, n, direction) else f
+    return result
+
+
+def __get_best_candidate_concurrently(fs: [Expr], n: Symbol, direction: Direction) -> Expr:
+    """
+    Splits the candidates into one chunk per process. Every process determines the best candidate of its chunk and
+    the best candidate is determined among the winners of the chunks.
+    """
+    chunks = [chunk for chunk in (fs[i::bound_jobs] for i in range(bound_jobs)) if chunk]
+    tasks = [partial(__get_best_candidate, chunk, n, direction) for chunk in chunks]
+    # if the comparisons fail in a process, they are redone in this process
+    fallback = lambda i, _: __get_best_candidate(chunks[i], n, direction)
+    winners = [winner for _, winner in run_forked(tasks, fallback)]
+
+    # keep the order of the candidates to be independent of which process finished first
+    winners.sort(key=fs.index)
+    return __get_best_candidate(winners, n, direction)
+
+
+@traced("asymptotics")
 def is_dominating_or_same(f1: Expr, f2: Expr, n: Symbol, direction: Direction = Direction.PosInf) -> bool:
     """
     Given two expressions in n it returns True iff the first expression eventually dominates the second one, modulo a
@@ -42,6 +186,13 @@ def is_dominating_or_same(f1: Expr, f2: Expr, n: Symbol, direction: Direction =
     """
     upper = direction is Direction.PosInf
     lower = not upper
+
+    # Most expressions are exponential polynomials, for which dominance can be read off their growth classes
+    growth_f1 = get_growth(f1, n)
+    growth_f2 = get_growth(f2, n) if growth_f1 is not None else None
+    if growth_f1 is not None and growth_f2 is not None:
+        return is_dominating_or_same_by_growth(growth_f1, growth_f2, direction)
+
     limit_f1 = amber_limit(f1, n)
     limit_f2 = amber_limit(f2, n)
 
@@ -71,6 +222,37 @@ def is_dominating_or_same(f1: Expr, f2: Expr, n: Symbol, direction: Direction =
         return (upper and amber_limit(f1 / f2, n).is_finite) or (lower and amber_limit(f1 / f2, n) > 0)
 
 
+def is_dominating_or_same_by_growth(g1: Growth, g2: Growth, direction: Direction = Direction.PosInf) -> bool:
+    """
+    The same as is_dominating_or_same, but for two expressions given by their growth classes. The cases follow the
+    ones of is_dominating_or_same, with the limits replaced by what they are for the given growth classes.
+    """
+    upper = direction is Direction.PosInf
+    lower = not upper
+    infinity_f1 = g1.limit_infinity
+    infinity_f2 = g2.limit_infinity
+
+    # if both limits are constant
+    if infinity_f1 == 0 and infinity_f2 == 0:
+        sign_f1 = g1.limit_sign
+        sign_f2 = g2.limit_sign
+        if upper:
+            return sign_f1 > 0 or sign_f2 < 0 or (sign_f1 == 0 and sign_f2 == 0)
+        else:
+            return sign_f1 < 0 or sign_f2 > 0 or (sign_f1 == 0 and sign_f2 == 0)
+
+    if infinity_f1 != infinity_f2:
+        return (upper and infinity_f1 > infinity_f2) or (lower and infinity_f1 < infinity_f2)
+
+    # both limits are the same infinity, so the limit of f1/f2 is determined by the dominant terms
+    comparison = g1.compare(g2)
+    if infinity_f1 == 1:
+        return (upper and comparison >= 0) or (lower and comparison <= 0)
+    else:
+        return (upper and comparison <= 0) or (lower and comparison >= 0)
+
+
+@traced("asymptotics")
 def simplify_asymptotically(expression: Expr, n: Symbol):
     """
     For a given expression returns another expression such that eventually the two expressions grow/shrink at
@@ -80,6 +262,12 @@ def simplify_asymptotically(expression: Expr, n: Symbol):
         return expression
 
     expression = expand(expression)
+
+    # For exponential polynomials the dominant term can be read off directly, which avoids the expensive Order
+    growth = get_growth(expression, n)
+    if growth is not None:
+        return __simplify_by_growth(expression, growth, n)
+
     limit_exp = amber_limit(expression, n)
     if limit_exp == 0:
         return expression
@@ -89,3 +277,18 @@ def simplify_asymptotically(expression: Expr, n: Symbol):
         c = -c
 
     return c * Order(expression, (n, oo)).expr
+
+
+def __simplify_by_growth(expression: Expr, growth: Growth, n: Symbol) -> Expr:
+    """
+    The same as simplify_asymptotically for an expression with a given growth class. The result is always of the
+    canonical form c * n**power * base**n.
+    """
+    if growth.limit_sign == 0:
+        return expression
+
+    c = unique_symbol('c', positive=True, real=True)
+    if growth.sign < 0:
+        c = -c
+
+    return c * n ** growth.power * growth.base ** n
@@ -2,14 +2,15 @@
 This modules contains functions providing the bounds of given monomials and polynomial expressions.
 """
 
-from diofant import *
-from mora.core import Program, get_solution as get_expected
-from .utils import *
-from .asymptotics import *
+from diofant import Expr, Number, Poly, expand, igcd, nan, oo, simplify, solve, summation, symbols, sympify
+from mora.core import get_solution as get_expected
+from mora.exppoly import solve_recurrence_in_closed_form
+from mora.trace import traced
+from .utils import LOG_ESSENTIAL, log, amber_limit, divide_monom_powers_by, get_all_monom_powers, get_monoms, \
+    get_polarity, get_signums_in_expression, monom_is_deterministic, separate_rvs_from_monom, unique_symbol
+from .asymptotics import dominating, dominated, simplify_asymptotically
 from . import branch_store
-
-store = {}
-program: Program = None
+from .context import AnalysisContext
 
 
 class Bounds:
@@ -28,20 +29,11 @@ class Bounds:
         return self.__absolute_upper__
 
 
-def set_program(p: Program):
-    """
-    Set the program and initialize the store. This function needs to be called before the store is used.
-    """
-    global program, store
-    program = p
-    store = {}
-
-
-def __multiply_rvs_for_monom_bounds(rvs, monom_bounds: Bounds, original_monom: Expr):
+def __multiply_rvs_for_monom_bounds(context: AnalysisContext, rvs, monom_bounds: Bounds, original_monom: Expr):
     """
     Given bounds for a monom x, computes bounds for the monom rvs * x by handling one random variable in rv at a time
     """
-    global program
+    program = context.program
     n = symbols("n", integer=True, positive=True)
     result_bounds = Bounds()
     result_bounds.expression = original_monom.as_poly(program.variables)
@@ -73,22 +65,23 @@ def __multiply_rvs_for_monom_bounds(rvs, monom_bounds: Bounds, original_monom: E
         result_bounds.maybe_positive = (rv_pos and result_bounds.maybe_positive) or (rv_neg and result_bounds.maybe_negative)
         result_bounds.maybe_negative = (rv_neg and result_bounds.maybe_positive) or (rv_pos and result_bounds.maybe_negative)
 
-    store[result_bounds.expression] = result_bounds
+    context.bound_store[result_bounds.expression] = result_bounds
     return result_bounds
 
 
-def get_bounds_of_expr(expression: Expr) -> Bounds:
+@traced("bounds", lambda context, expression: {"expression": expression})
+def get_bounds_of_expr(context: AnalysisContext, expression: Expr) -> Bounds:
     """
     Computes the bounds of a polynomial over the program variables. It does so by substituting the bounds of the monomials.
     """
-    expression = expression.as_poly(program.variables)
+    expression = expression.as_poly(context.program.variables)
     expr_bounds = __initialize_bounds_for_expression(expression)
     monoms = get_monoms(expression)
     for monom in monoms:
-        rvs, m = separate_rvs_from_monom(monom, program)
-        m_bounds = __get_bounds_of_monom(m)
+        rvs, m = separate_rvs_from_monom(monom, context.program)
+        m_bounds = __get_bounds_of_monom(context, m)
         if rvs:
-            monom_bounds = __multiply_rvs_for_monom_bounds(rvs, m_bounds, monom)
+            monom_bounds = __multiply_rvs_for_monom_bounds(context, rvs, m_bounds, monom)
         else:
             monom_bounds = m_bounds
         __replace_monom_in_expr_bounds(monom, monom_bounds, expression, expr_bounds)
@@ -148,46 +141,45 @@ def __initialize_bounds_for_expression(expression: Poly) -> Bounds:
     return bounds
 
 
-def __get_bounds_of_monom(monom: Expr) -> Bounds:
+def __get_bounds_of_monom(context: AnalysisContext, monom: Expr) -> Bounds:
     """
     Computes the bounds of a monomial in a lazy way
     """
     monom = sympify(monom).as_expr()
-    if monom not in store:
-        __compute_bounds_of_monom(monom)
-    return store[monom]
+    if monom not in context.bound_store:
+        __compute_bounds_of_monom(context, monom)
+    return context.bound_store[monom]
 
 
-def __compute_bounds_of_monom(monom: Expr):
+@traced("bounds", lambda context, monom: {"monomial": monom})
+def __compute_bounds_of_monom(context: AnalysisContext, monom: Expr):
     """
     Computes the bounds of a monomial. First checks if the monomial is deterministic, then if it is another
     monomial to an odd power and only after that computes the bounds via recurrences.
     """
-    global program
     log(f"Computing bounds for {monom.as_expr()}", LOG_ESSENTIAL)
-    if monom_is_deterministic(monom, program):
-        __compute_bounds_of_deterministic_monom(monom)
+    if monom_is_deterministic(monom, context.program):
+        __compute_bounds_of_deterministic_monom(context, monom)
         return
 
     powers = get_all_monom_powers(monom)
     power_gcd = igcd(*powers)
     if power_gcd > 1 and power_gcd % 2 == 1:
         monom = divide_monom_powers_by(monom, power_gcd)
-        __compute_bounds_of_monom_power(monom, power_gcd)
+        __compute_bounds_of_monom_power(context, monom, power_gcd)
         return
 
-    __compute_bounds_of_monom_recurrence(monom)
+    __compute_bounds_of_monom_recurrence(context, monom)
 
 
-def __compute_bounds_of_deterministic_monom(monom):
+def __compute_bounds_of_deterministic_monom(context: AnalysisContext, monom):
     """
     Computes the bounds of a deterministic monomial by replacing its variables by their first moments, which are
     their exact closed-form representations
     """
-    global program
     bound = monom
     for variable in monom.free_symbols:
-        moment = get_expected(program, variable.as_poly(program.variables))
+        moment = get_expected(context, variable.as_poly(context.program.variables))
         bound = bound.subs({variable: moment})
 
     n = symbols("n", integer=True, positive=True)
@@ -201,16 +193,16 @@ def __compute_bounds_of_deterministic_monom(monom):
     bounds.maybe_positive = pos
     bounds.maybe_negative = neg
 
-    store[bounds.expression] = bounds
+    context.bound_store[bounds.expression] = bounds
 
 
-def __compute_bounds_of_monom_power(monom: Expr, power: Number):
+def __compute_bounds_of_monom_power(context: AnalysisContext, monom: Expr, power: Number):
     """
     Computes the bounds of monom**power by just taking the bounds of monom and raising it to the given power.
     This is only sound if the given power is odd or the monom is always positive
     """
     n = symbols("n", integer=True, positive=True)
-    monom_bounds = __get_bounds_of_monom(monom)
+    monom_bounds = __get_bounds_of_monom(context, monom)
     upper_bound = simplify_asymptotically(monom_bounds.upper ** power, n)
     lower_bound = simplify_asymptotically(monom_bounds.lower ** power, n)
 
@@ -221,17 +213,18 @@ def __compute_bounds_of_monom_power(monom: Expr, power: Number):
     bounds.maybe_positive = monom_bounds.maybe_positive
     bounds.maybe_negative = monom_bounds.maybe_negative
 
-    store[bounds.expression] = bounds
+    context.bound_store[bounds.expression] = bounds
 
 
-def __compute_bounds_of_monom_recurrence(monom: Expr):
+@traced("bounds", lambda context, monom: {"monomial": monom})
+def __compute_bounds_of_monom_recurrence(context: AnalysisContext, monom: Expr):
     """
     Computes the bounds of a monomial by representing it as a recurrence relation
     """
     n = symbols("n", integer=True, positive=True)
-    branches = branch_store.get_branches_of_monom(monom)
-    inhom_parts_bounds = [get_bounds_of_expr(b.inhom_part) for b in branches]
-    initial_polarity = branch_store.get_initial_polarity_of_monom(monom)
+    branches = branch_store.get_branches_of_monom(context, monom)
+    inhom_parts_bounds = [get_bounds_of_expr(context, b.inhom_part) for b in branches]
+    initial_polarity = branch_store.get_initial_polarity_of_monom(context, monom)
     maybe_pos, maybe_neg = __get_monom_polarity(monom, inhom_parts_bounds, initial_polarity)
 
     inhom_parts_bounds_lower = [expand(b.lower.xreplace({n: n - 1})) for b in inhom_parts_bounds]
@@ -271,7 +264,7 @@ def __compute_bounds_of_monom_recurrence(monom: Expr):
     bounds.maybe_positive = maybe_pos
     bounds.maybe_negative = maybe_neg
 
-    store[bounds.expression] = bounds
+    context.bound_store[bounds.expression] = bounds
 
 
 def __get_monom_polarity(monom: Expr, inhom_parts_bounds: [Bounds], initial_polarity) -> (bool, bool):
@@ -324,6 +317,7 @@ def __compute_bound_candidates(coefficients: [Number], inhom_parts: [Expr], star
     return candidates
 
 
+@traced("bounds")
 def __compute_bound_candidate(c: Number, inhom_part: Expr, starting_value: Expr) -> Expr:
     """
     Computes a single function which is potentially a bound by solving a recurrence relation
@@ -332,6 +326,10 @@ def __compute_bound_candidate(c: Number, inhom_part: Expr, starting_value: Expr)
     if c.is_zero:
         return expand(inhom_part.xreplace({n: n - 1}))
 
+    solution = solve_recurrence_in_closed_form(c, inhom_part, starting_value, n)
+    if solution is not None:
+        return solution
+
     hom_solution = (c ** n) * starting_value
     k = symbols('_k', integer=True, positive=True)
     summand = simplify((c ** k) * inhom_part.xreplace({n: (n - 1) - k}))
@@ -1,7 +1,8 @@
 from diofant import sympify
 
 from mora.input import InputParser
-from . import branch_store, bound_store
+from . import bound_store
+from .context import AnalysisContext
 from .utils import log, LOG_ESSENTIAL
 
 
@@ -9,10 +10,9 @@ def bounds(benchmark, expression):
     input_parser = InputParser()
     input_parser.set_source(benchmark)
     program = input_parser.parse_source()
-    branch_store.set_program(program)
-    bound_store.set_program(program)
+    context = AnalysisContext(program)
     expression = sympify(expression)
-    bounds = bound_store.get_bounds_of_expr(expression)
+    bounds = bound_store.get_bounds_of_expr(context, expression)
     log(f"Expression: {bounds.expression}", LOG_ESSENTIAL)
 
     log(f"Lower bound: {bounds.lower}", LOG_ESSENTIAL)
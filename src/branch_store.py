@@ -12,11 +12,11 @@ Branches of x*y:
 - (x - 1)(y + 1) @ 1/4
 - (x + 1)(y + 1) @ 1/4
 
-The branches of monomials are computed just in time and stored so they can be reused.
+The branches of monomials are computed just in time and stored in the analysis context so they can be reused.
 """
 
-from diofant import *
-from mora.core import Program
+from diofant import Expr, Number, Poly, sympify
+from .context import AnalysisContext
 from .expression import get_cases_for_expression, get_initial_polarity_for_expression
 
 
@@ -32,48 +32,31 @@ class Branch:
     initial_value: Number
 
 
-store = {}
-initial_value_store = {}
-program: Program = None
-
-
-def set_program(p: Program):
-    """
-    Set the program and initialize the store. This function needs to be called before the store is used.
-    """
-    global program, store, initial_value_store
-    program = p
-    store = {}
-    initial_value_store = {}
-
-
-def get_branches_of_monom(monom: Expr) -> [Branch]:
+def get_branches_of_monom(context: AnalysisContext, monom: Expr) -> [Branch]:
     """
     Lazily computes the branches of a given monomial and returns them.
     """
     monom = sympify(monom)
-    if monom not in store:
-        __compute_branches(monom)
-    return store[monom]
+    if monom not in context.branch_store:
+        __compute_branches(context, monom)
+    return context.branch_store[monom]
 
 
-def get_initial_polarity_of_monom(monom: Expr) -> (bool, bool):
+def get_initial_polarity_of_monom(context: AnalysisContext, monom: Expr) -> (bool, bool):
     """
     Lazily computes the initial value of a given monomial and returns them.
     """
-    global program, initial_value_store
     monom = sympify(monom)
-    if monom not in initial_value_store:
-        initial_value_store[monom] = get_initial_polarity_for_expression(monom, program)
-    return initial_value_store[monom]
+    if monom not in context.initial_value_store:
+        context.initial_value_store[monom] = get_initial_polarity_for_expression(monom, context.program)
+    return context.initial_value_store[monom]
 
 
-def __compute_branches(monom: Expr):
-    global program
+def __compute_branches(context: AnalysisContext, monom: Expr):
     monom = sympify(monom)
-    cases = get_cases_for_expression(monom, program)
+    cases = get_cases_for_expression(monom, context.program)
     branches = __cases_to_branches(cases, monom)
-    store[monom] = branches
+    context.branch_store[monom] = branches
 
 
 def __cases_to_branches(cases, monom):
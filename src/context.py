@@ -0,0 +1,23 @@
+"""
+This module contains the analysis context of Amber. It extends the context of mora by the stores of the branches,
+initial polarities and bounds of monomials. All of them belong to a single program, such that several programs can be
+analysed in the same process, each one with its own context.
+
+A context is not thread-safe and must not be shared between threads. Its stores get filled without locking and the
+rules extend the program of the context, e.g. by the variables splitting a random variable with symbolic support.
+Contexts can be shared with forked processes, as every process works on its own copy.
+"""
+
+from mora.core import Context, Program
+
+
+class AnalysisContext(Context):
+
+    def __init__(self, program: Program):
+        super(AnalysisContext, self).__init__(program)
+        # Stores the branches of monomials
+        self.branch_store = {}
+        # Stores the initial polarities of monomials
+        self.initial_value_store = {}
+        # Stores the bounds of monomials
+        self.bound_store = {}
@@ -3,66 +3,151 @@ This is the module which handles the decision on what proof-rule to apply to a p
 to get something about its termination behavior. Then the proof-rule gets applied
 """
 
-from mora.core import Program, get_solution as get_expected, get_recurrence, reset_mora
+import time
+from contextlib import closing
+from functools import partial
+
+from mora.core import Program, get_solution as get_expected, get_recurrence
 from mora.input import LOOP_GUARD_VAR
+from mora.processes import run_forked
+from mora.trace import span, get_trace_events, add_trace_events, clear_trace_events
 from diofant import sympify, symbols, expand, simplify
 
-from . import branch_store, bound_store
+from .context import AnalysisContext
 from .initial_state_rule import InitialStateRule
 from .supermartingale_rule import SupermartingaleRule
 from .ranking_sm_rule import RankingSMRule
 from .repulsing_sm_rule import RepulsingSMRule
-from .rule import Result
+from .rule import Rule, Result
 from .utils import LOG_ESSENTIAL, log, substitute_deterministic_variables
 
+# If set, the proof rules get applied concurrently in separate processes instead of one after another
+parallel_rules = False
+
+
+def set_parallel_rules(enabled: bool):
+    global parallel_rules
+    parallel_rules = enabled
 
-def decide_termination(program: Program):
+
+def decide_termination(program: Program, context: AnalysisContext = None):
     """
-    The main function, gathering all the information, deciding on and calling a proof-rule
+    The main function, gathering all the information, deciding on and calling a proof-rule. If no analysis context
+    of the program is given, the analysis starts from a fresh one.
     """
-    reset_mora()
-    branch_store.set_program(program)
-    bound_store.set_program(program)
-    lgc = get_loop_guard_change(program)
-    me_pos = create_martingale_expression(program)
-    me_neg = expand(me_pos * (-1))
+    result = Result()
+    if context is None:
+        context = AnalysisContext(program)
+
+    start = time.time()
+    with span("loop_guard_change", "preprocessing"):
+        lgc = get_loop_guard_change(context)
+    result.timings["loop_guard_change"] = time.time() - start
+
+    start = time.time()
+    with span("martingale_expression", "preprocessing"):
+        me_pos = create_martingale_expression(context)
+        me_neg = expand(me_pos * (-1))
+    result.timings["martingale_expression"] = time.time() - start
     log(f"Martingale expression: {me_pos.as_expr()}", LOG_ESSENTIAL)
     rules = [
-        InitialStateRule(lgc, me_pos, program),
-        RankingSMRule(lgc, me_pos, program),
-        SupermartingaleRule(lgc, me_pos, program),
-        RepulsingSMRule(lgc, me_neg, program)
+        InitialStateRule(lgc, me_pos, context),
+        RankingSMRule(lgc, me_pos, context),
+        SupermartingaleRule(lgc, me_pos, context),
+        RepulsingSMRule(lgc, me_neg, context)
     ]
-    result = Result()
+
+    if parallel_rules:
+        return run_rules_concurrently(rules, result)
 
     for rule in rules:
-        if rule.is_applicable():
-            result = rule.run(result)
+        start = time.time()
+        with span(type(rule).__name__, "rules"):
+            if rule.is_applicable():
+                result = rule.run(result)
+        result.timings[type(rule).__name__] = time.time() - start
+        if result.all_known():
+            break
+
+    return result
+
+
+def run_rules_concurrently(rules: [Rule], result: Result) -> Result:
+    """
+    Applies all rules at the same time, each in its own forked process which inherits the already computed stores.
+    Every property gets decided by the first rule finishing with a conclusive answer for it. As soon as all properties
+    are known, the remaining rules get cancelled.
+    """
+    tasks = [partial(__run_rule_isolated, rule) for rule in rules]
+    with closing(run_forked(tasks)) as runs:
+        for _, outcome in runs:
+            # a rule whose process died decides nothing
+            if outcome is not None:
+                rule_result, events = outcome
+                add_trace_events(events)
+                __merge_rule_result(result, rule_result)
+                result.timings.update(rule_result.timings)
             if result.all_known():
                 break
 
     return result
 
 
-def create_martingale_expression(program: Program):
+def __run_rule_isolated(rule: Rule):
+    """
+    Applies a single rule in a process of its own and returns its result together with the trace events of the process
+    """
+    clear_trace_events()
+    rule_result = Result()
+    start = time.time()
+    try:
+        with span(type(rule).__name__, "rules"):
+            if rule.is_applicable():
+                rule_result = rule.run(rule_result)
+    except Exception as e:
+        log(f"{type(rule).__name__} failed: {e}", LOG_ESSENTIAL)
+        rule_result = Result()
+    rule_result.timings[type(rule).__name__] = time.time() - start
+    return rule_result, get_trace_events()
+
+
+def __merge_rule_result(result: Result, rule_result: Result):
+    """
+    Takes over the answers of a rule which are not known yet, together with the witnesses of the rule for them
+    """
+    decided = set()
+    if not result.PAST.is_known() and rule_result.PAST.is_known():
+        result.PAST = rule_result.PAST
+        decided.add("PAST")
+    if not result.AST.is_known() and rule_result.AST.is_known():
+        result.AST = rule_result.AST
+        decided.add("AST")
+    for witness in rule_result.witnesses:
+        # the kind of a witness is either the property it proves or "Not" followed by the property it refutes
+        if witness.kind.replace("Not ", "") in decided:
+            result.add_witness(witness)
+
+
+def create_martingale_expression(context: AnalysisContext):
     """
     Creates the martingale expression E(M_{i+1} - M_i | F_i). Also deterministic variables get substituted
     with their representation in n.
     """
+    program = context.program
     lg = symbols(LOOP_GUARD_VAR).as_poly(program.variables)
-    expected_guard = get_recurrence(program, lg)
+    expected_guard = get_recurrence(context, lg)
     lg = program.updates[symbols(LOOP_GUARD_VAR)].branches[0][0]
     expression = expand(expected_guard - lg).as_expr()
-    expression = substitute_deterministic_variables(expression, program)
+    expression = substitute_deterministic_variables(expression, context)
     return simplify(expression)
 
 
-def get_loop_guard_change(program: Program):
+def get_loop_guard_change(context: AnalysisContext):
     """
     Returns E[LG_{n+1} - LG_{n}]
     """
     n = symbols("n", integer=True, positive=True)
-    lg = sympify(LOOP_GUARD_VAR).as_poly(program.variables)
-    expected_lg = get_expected(program, lg)
+    lg = sympify(LOOP_GUARD_VAR).as_poly(context.program.variables)
+    expected_lg = get_expected(context, lg)
     expected_lg_plus = expected_lg.xreplace({n: n+1})
     return expand(expected_lg_plus - expected_lg)
\ No newline at end of file
@@ -7,6 +7,7 @@ from typing import Iterable, Tuple
 
 from diofant import Expr, Symbol, simplify, Rational, symbols, Number, Min, Max
 from mora.core import Program, RandomVar, Update
+from mora.trace import traced
 
 # Type aliases to improve readability
 from src.utils import unique_symbol, get_monoms, flatten_substitution_choices
@@ -15,6 +16,7 @@ Probability = Rational
 Case = (Expr, Probability)
 
 
+@traced("cases", lambda expression, program: {"expression": expression})
 def get_cases_for_expression(expression: Expr, program: Program) -> [Case]:
     """
     The main function computing all possible expression_{i+1} together with the associated probabilities
@@ -127,6 +129,7 @@ def split_expressions_on_rv(expressions: [Case], rv: Symbol, program: Program):
         1. rv is replaced by a random variable with only negative support
         2. rv is replaced by a random variable with support ranging over 0
         3. rv is replaced by a random variable with support only positive
+    The new random variables get added to the program, hence the program must not be shared between threads.
     """
     low, high = program.updates[rv].random_var.get_support()
     if low > 0 or high < 0:
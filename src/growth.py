@@ -0,0 +1,97 @@
+"""
+This module contains functions to determine the growth class of expressions in n. For an exponential polynomial
+(a sum of terms c * n**k * b**n) the growth class is given by its dominant term, i.e. the term with the largest
+base b and, among those, the largest power k, together with the sign of the term's coefficient c.
+Comparing growth classes is cheap compared to computing symbolic limits.
+"""
+
+from diofant import Expr, Integer, Symbol
+
+from mora.exppoly import ExpPoly
+
+
+class Growth:
+    """
+    The growth class c * n**power * base**n of an expression. The sign is the sign of c, which is 0 iff the expression
+    is 0, in which case base and power are irrelevant.
+    """
+    base: Expr
+    power: int
+    sign: int
+    coefficient: Expr
+
+    def __init__(self, base: Expr, power: int, sign: int, coefficient: Expr):
+        self.base = base
+        self.power = power
+        self.sign = sign
+        self.coefficient = coefficient
+
+    @property
+    def limit_infinity(self) -> int:
+        """
+        Returns 1 if the expression goes to oo, -1 if it goes to -oo and 0 if its limit is finite
+        """
+        if self.sign != 0 and compare_terms((self.base, self.power), (Integer(1), 0)) > 0:
+            return self.sign
+        return 0
+
+    @property
+    def limit_sign(self) -> int:
+        """
+        Returns the sign of the limit of the expression, which is 0 if the expression converges to 0
+        """
+        if self.sign != 0 and compare_terms((self.base, self.power), (Integer(1), 0)) >= 0:
+            return self.sign
+        return 0
+
+    def compare(self, other: "Growth") -> int:
+        """
+        Returns 1 if the absolute value of this growth class eventually dominates the other one, -1 if it is dominated
+        and 0 if both are equal modulo a positive constant factor
+        """
+        if self.sign == 0 or other.sign == 0:
+            return (self.sign != 0) - (other.sign != 0)
+        return compare_terms((self.base, self.power), (other.base, other.power))
+
+
+def compare_terms(t1: (Expr, int), t2: (Expr, int)) -> int:
+    """
+    Compares the growth of two terms n**k1 * b1**n and n**k2 * b2**n, given as (b1, k1) and (b2, k2), for
+    positive numeric b1 and b2
+    """
+    b1, k1 = t1
+    b2, k2 = t2
+    if b1 == b2:
+        return (k1 > k2) - (k1 < k2)
+    return 1 if bool(b1 > b2) else -1
+
+
+def get_growth(expression: Expr, n: Symbol):
+    """
+    Returns the growth class of a given expression or None if the expression is not an exponential polynomial with
+    positive numeric bases or if the sign of its dominant term cannot be determined.
+    """
+    exppoly = ExpPoly.from_expr(expression, n)
+    if exppoly is None:
+        return None
+    if exppoly.is_zero():
+        return Growth(Integer(1), 0, 0, Integer(0))
+
+    for base, _ in exppoly.terms.keys():
+        if not (base.is_number and base.is_positive):
+            return None
+
+    dominant = None
+    for term in exppoly.terms.keys():
+        if dominant is None or compare_terms(term, dominant) > 0:
+            dominant = term
+
+    coefficient = exppoly.terms[dominant]
+    if coefficient.is_positive:
+        sign = 1
+    elif coefficient.is_negative:
+        sign = -1
+    else:
+        return None
+
+    return Growth(dominant[0], dominant[1], sign, coefficient)
@@ -4,13 +4,13 @@ More precisely, it decides whether expression <= 0 is eventually invariant.
 The methods are of course not complete in general.
 """
 from diofant import Expr, sympify, symbols
-from mora.core import Program
 from . import bound_store
+from .context import AnalysisContext
 from .utils import get_max_0, Answer
 from .asymptotics import is_dominating_or_same, Direction
 
 
-def is_invariant(expression: Expr, program: Program) -> bool:
+def is_invariant(expression: Expr, context: AnalysisContext) -> bool:
     """
     Main function deciding whether expression <= 0 is eventually invariant
     """
@@ -19,7 +19,7 @@ def is_invariant(expression: Expr, program: Program) -> bool:
     if is_deterministic:
         return is_deterministic_invariant(expression)
     else:
-        return is_probabilistic_invariant(expression, program)
+        return is_probabilistic_invariant(expression, context)
 
 
 def is_deterministic_invariant(expression: Expr) -> bool:
@@ -31,22 +31,22 @@ def is_deterministic_invariant(expression: Expr) -> bool:
     return expression.subs({n: max_0 + 1}) <= 0
 
 
-def is_probabilistic_invariant(expression: Expr, program: Program) -> bool:
+def is_probabilistic_invariant(expression: Expr, context: AnalysisContext) -> bool:
     """
     Tries several strategies to determine if a given expression eventually stays <= 0
     """
-    answer = __is_probabilistic_invariant_via_bounds(expression)
+    answer = __is_probabilistic_invariant_via_bounds(context, expression)
     if answer.is_known():
         return answer.is_true()
     raise NotImplemented()
 
 
-def __is_probabilistic_invariant_via_bounds(expression: Expr) -> Answer:
+def __is_probabilistic_invariant_via_bounds(context: AnalysisContext, expression: Expr) -> Answer:
     """
     Tries to decide if expression <= 0 eventually becomes invariant via bounds.
     """
     n = symbols("n", integer=True, positive=True)
-    bounds = bound_store.get_bounds_of_expr(expression)
+    bounds = bound_store.get_bounds_of_expr(context, expression)
     if is_dominating_or_same(bounds.upper, sympify(-1), n, direction=Direction.NegInf):
         return Answer.TRUE
 
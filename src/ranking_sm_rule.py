@@ -23,11 +23,11 @@ class RankingSMRule(Rule):
             return result
 
         # Martingale expression has to be <= 0 eventually
-        if not is_invariant(self.martingale_expression, self.program):
+        if not is_invariant(self.martingale_expression, self.context):
             return result
 
         # To be ranking martingale expression has to eventually decrease more or equal to constant
-        bounds = bound_store.get_bounds_of_expr(self.martingale_expression)
+        bounds = bound_store.get_bounds_of_expr(self.context, self.martingale_expression)
         n = symbols("n", integer=True, positive=True)
         if not is_dominating_or_same(bounds.upper, sympify(-1), n, direction=Direction.NegInf):
             return result
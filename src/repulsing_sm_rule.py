@@ -5,11 +5,11 @@ This module implements the repulsing supermartingale proof rule
 from diofant import symbols, sympify, simplify
 
 from . import bound_store
-from .asymptotics import is_dominating_or_same, Answer, dominating
+from .asymptotics import is_dominating_or_same, dominating
 from .expression import get_cases_for_expression, split_expressions_on_rvs
 from .invariance import is_invariant
 from .rule import Rule, Result, Witness
-from .utils import amber_limit
+from .utils import Answer, amber_limit
 
 
 class RepulsingSMRule(Rule):
@@ -24,14 +24,14 @@ class RepulsingSMRule(Rule):
             return result
 
         # Martingale expression has to be <= 0 eventually
-        if not is_invariant(self.martingale_expression, self.program):
+        if not is_invariant(self.martingale_expression, self.context):
             return result
 
         branches = get_cases_for_expression(sympify(self.program.loop_guard), self.program)
         if self.program.contains_rvs:
             branches = split_expressions_on_rvs(branches, self.program)
         branches = [simplify(branch - sympify(self.program.loop_guard)) for branch, _ in branches]
-        bounds = [bound_store.get_bounds_of_expr(case) for case in branches]
+        bounds = [bound_store.get_bounds_of_expr(self.context, case) for case in branches]
 
         # Make sure that there is always a positive probability of having a next iteration
         if all([cb.maybe_negative for cb in bounds]):
@@ -39,7 +39,7 @@ class RepulsingSMRule(Rule):
 
         n = symbols("n", integer=True, positive=True)
         cs = dominating([cb.absolute_upper for cb in bounds], n)
-        epsilons = simplify(bound_store.get_bounds_of_expr(self.martingale_expression).upper * -1)
+        epsilons = simplify(bound_store.get_bounds_of_expr(self.context, self.martingale_expression).upper * -1)
 
         # Epsilons and cs have to be bound by a constant
         if not is_dominating_or_same(sympify(1), epsilons, n):
@@ -7,6 +7,8 @@ class Result:
         self.PAST = Answer.UNKNOWN
         self.AST = Answer.UNKNOWN
         self.witnesses = []
+        # Seconds spent in the different phases of the analysis
+        self.timings = {}
 
     def all_known(self) -> bool:
         return self.PAST.is_known() and self.AST.is_known()
@@ -14,6 +16,14 @@ class Result:
     def add_witness(self, witness):
         self.witnesses.append(witness)
 
+    def to_dict(self) -> dict:
+        return {
+            "PAST": str(self.PAST),
+            "AST": str(self.AST),
+            "witnesses": [witness.to_dict() for witness in self.witnesses],
+            "timings": {phase: round(seconds, 4) for phase, seconds in self.timings.items()}
+        }
+
     def print(self):
         log("", LOG_ESSENTIAL)
         log("", LOG_ESSENTIAL)
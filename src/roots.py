@@ -0,0 +1,132 @@
+"""
+This module contains functions to bound the largest real zero of an expression in n without solving it symbolically.
+For polynomials the number of zeros above a point is counted with Sturm sequences, such that the ceiling of the largest
+zero can be found by a binary search below a root bound. For exponential polynomials a point is computed beyond which
+the dominant term outweighs all other terms and the integers below it are scanned for sign changes.
+"""
+
+import math
+
+from diofant import Expr, Poly, Rational, Symbol
+
+from mora.exppoly import ExpPoly
+
+# Exponential polynomials whose dominant term only takes over after more than this many iterations are not scanned
+MAX_SCAN_LENGTH = 1000
+
+
+def get_max_0_by_bounding(expression: Expr, n: Symbol):
+    """
+    Returns the ceiling of the maximum positive zero of a given expression or 0 if it does not exist. Returns None
+    if the expression is neither a polynomial nor an exponential polynomial with rational coefficients and bases.
+    """
+    if expression.free_symbols != {n}:
+        return None
+
+    if expression.is_polynomial(n):
+        poly = Poly(expression, n)
+        if poly.domain.is_RationalField or poly.domain.is_IntegerRing:
+            return __get_max_0_of_polynomial(poly)
+        return None
+
+    exppoly = ExpPoly.from_expr(expression, n)
+    if exppoly is None:
+        return None
+    return __get_max_0_of_exppoly(exppoly)
+
+
+def __get_max_0_of_polynomial(poly: Poly) -> int:
+    """
+    Returns the smallest non-negative integer m such that the polynomial has no zero in (m, oo)
+    """
+    if poly.degree() <= 0:
+        return 0
+
+    sturm = __sturm_sequence(poly)
+    zeros_at_infinity = __sign_changes([p.LC() for p in sturm])
+
+    def has_zero_above(m: int) -> bool:
+        return __sign_changes([p.eval(m) for p in sturm]) > zeros_at_infinity
+
+    if not has_zero_above(0):
+        return 0
+
+    # all zeros are smaller than the Cauchy bound
+    coeffs = poly.all_coeffs()
+    high = math.ceil(1 + max(abs(c / coeffs[0]) for c in coeffs[1:]))
+    low = 0
+    while high - low > 1:
+        middle = (low + high) // 2
+        if has_zero_above(middle):
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def __sturm_sequence(poly: Poly) -> [Poly]:
+    """
+    Returns the Sturm sequence of the square-free part of a given polynomial
+    """
+    poly = poly.sqf_part()
+    sequence = [poly, poly.diff()]
+    while not sequence[-1].is_zero and sequence[-1].degree() > 0:
+        sequence.append(-sequence[-2].rem(sequence[-1]))
+    return [p for p in sequence if not p.is_zero]
+
+
+def __sign_changes(values: [Rational]) -> int:
+    signs = [v > 0 for v in values if v != 0]
+    return sum(1 for s1, s2 in zip(signs, signs[1:]) if s1 != s2)
+
+
+def __get_max_0_of_exppoly(exppoly: ExpPoly):
+    """
+    Returns the ceiling of the largest zero of an exponential polynomial with positive rational bases and rational
+    coefficients, as far as it is witnessed by a sign change or a zero at the integers. Returns None if this cannot be
+    certified cheaply.
+    """
+    if exppoly.is_zero():
+        return 0
+    for (base, _), coeff in exppoly.terms.items():
+        if not (base.is_Rational and base > 0 and coeff.is_Rational):
+            return None
+
+    dominant = max(exppoly.terms.keys(), key=lambda t: (t[0], t[1]))
+    start = __get_dominance_start(exppoly, dominant)
+    if start is None or start > MAX_SCAN_LENGTH:
+        return None
+
+    eventual_sign = exppoly.terms[dominant] > 0
+    for m in range(start, -1, -1):
+        value = sum(coeff * m ** power * base ** m for (base, power), coeff in exppoly.terms.items())
+        if value == 0:
+            return m
+        if (value > 0) != eventual_sign:
+            return m + 1
+    return 0
+
+
+def __get_dominance_start(exppoly: ExpPoly, dominant) -> int:
+    """
+    Returns an integer N such that for all real x >= N the dominant term outweighs the sum of all other terms.
+    Dividing by the dominant term, every other term becomes x**d * r**x with r <= 1, which is decreasing from N on.
+    Hence, it suffices that the sum is smaller than the dominant coefficient at N.
+    """
+    base, power = dominant
+    dominant_coeff = abs(exppoly.terms[dominant])
+    others = [(b / base, p - power, abs(c)) for (b, p), c in exppoly.terms.items() if (b, p) != dominant]
+    if not others:
+        return 0
+
+    start = 1
+    for r, d, _ in others:
+        if d > 0:
+            # x**d * r**x is decreasing for x >= d / -log(r)
+            start = max(start, math.ceil(d / -math.log(r)) + 1)
+
+    while start <= MAX_SCAN_LENGTH:
+        if sum(c * Rational(start) ** d * r ** start for r, d, c in others) < dominant_coeff:
+            return start
+        start *= 2
+    return None
@@ -4,17 +4,18 @@ This module contains implementations common to all termination proof rules
 
 from abc import ABC, abstractmethod
 from diofant import Expr
-from mora.core import Program
+from .context import AnalysisContext
 from .result import Result
 from .utils import log, LOG_ESSENTIAL
 
 
 class Rule(ABC):
 
-    def __init__(self, loop_guard_change: Expr, martingale_expression: Expr, program: Program):
+    def __init__(self, loop_guard_change: Expr, martingale_expression: Expr, context: AnalysisContext):
         self.loop_guard_change = loop_guard_change
         self.martingale_expression = martingale_expression
-        self.program = program
+        self.context = context
+        self.program = context.program
 
     @abstractmethod
     def is_applicable(self) -> bool: pass
@@ -30,6 +31,13 @@ class Witness(ABC):
         self.data = {}
         self.explanation = ""
 
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "data": {key: str(value) for key, value in self.data.items()},
+            "explanation": self.explanation
+        }
+
     def print(self):
         headline = f"Witness for {self.kind}"
         log(headline, LOG_ESSENTIAL)
@@ -0,0 +1,223 @@
+"""
+This module contains functions to run Amber on many benchmarks at once. Every benchmark gets analysed in its own
+worker process, such that the analysis contexts and the global state of mora and Amber (e.g. the cache and the counter
+of unique symbols) are isolated between benchmarks that run at the same time. A worker process can be killed if it runs
+for too long or uses too much memory, without affecting the remaining benchmarks.
+"""
+
+import io
+import resource
+import signal
+import time
+from contextlib import redirect_stdout
+from enum import Enum, auto
+from functools import partial
+
+from mora.core import moments
+from mora.input import InputParser, get_lark_parser, LOOP_GUARD_VAR
+from mora.processes import MEMORY_ERROR_EXIT_CODE, run_forked
+from mora.utils import set_log_level as set_mora_log_level, LOG_NOTHING as MORA_LOG_NOTHING
+from mora.trace import span, name_process, get_trace_events, add_trace_events, clear_trace_events
+from .decission import decide_termination
+from .bounds import bounds
+from .utils import get_limit_cache_statistics
+
+
+class Status(Enum):
+    OK = auto()
+    TIMEOUT = auto()
+    OOM = auto()
+    ERROR = auto()
+
+    def __str__(self):
+        return self.name
+
+
+def run_benchmark(benchmark: str, bounds_expression: str = "") -> str:
+    """
+    Runs Amber on a single benchmark and returns everything Amber printed while doing so
+    """
+    output = io.StringIO()
+    with redirect_stdout(output), span(benchmark, "benchmark"):
+        __run_benchmark(benchmark, bounds_expression)
+    return output.getvalue()
+
+
+def __run_benchmark(benchmark: str, bounds_expression: str):
+    if bounds_expression:
+        bounds(benchmark, bounds_expression)
+        return
+
+    try:
+        input_parser = InputParser()
+        input_parser.set_source(benchmark)
+        program = input_parser.parse_source()
+    except Exception as e:
+        print("Amber failed to parse source.")
+        print(e)
+        return
+
+    try:
+        start = time.time()
+        result = decide_termination(program)
+        result.print()
+        print(f"Computation time: { round(time.time() - start, 4) }s")
+    except MemoryError:
+        raise
+    except Exception as e:
+        print("Something went wrong while deciding termination.")
+        print(e)
+
+
+def analyse_benchmark(benchmark: str) -> dict:
+    """
+    Runs Amber on a single benchmark and returns the result as a dictionary, which can be serialized to JSON
+    """
+    with span(benchmark, "benchmark"):
+        return __analyse_benchmark(benchmark)
+
+
+def __analyse_benchmark(benchmark: str) -> dict:
+    data = {"benchmark": benchmark, "status": str(Status.OK)}
+    try:
+        start = time.time()
+        with span("parse", "preprocessing"):
+            input_parser = InputParser()
+            input_parser.set_source(benchmark)
+            program = input_parser.parse_source()
+        parse_time = time.time() - start
+    except Exception as e:
+        return get_failure_data(benchmark, Status.ERROR, f"Amber failed to parse source: {e}")
+
+    try:
+        limit_cache_before = get_limit_cache_statistics()
+        start = time.time()
+        with redirect_stdout(io.StringIO()):
+            result = decide_termination(program)
+        total_time = time.time() - start
+        limit_cache_after = get_limit_cache_statistics()
+    except MemoryError:
+        raise
+    except Exception as e:
+        return get_failure_data(benchmark, Status.ERROR, f"Something went wrong while deciding termination: {e}")
+
+    data.update(result.to_dict())
+    data["timings"] = {"parse": round(parse_time, 4), **data["timings"], "total": round(total_time, 4)}
+    data["limit_cache"] = {
+        "hits": limit_cache_after["hits"] - limit_cache_before["hits"],
+        "misses": limit_cache_after["misses"] - limit_cache_before["misses"],
+    }
+    return data
+
+
+def analyse_moments(benchmark: str, degree: int) -> dict:
+    """
+    Computes E[v^k] for all variables v of a single benchmark and all k up to the given degree in one pass and returns
+    them as a dictionary, which can be serialized to JSON
+    """
+    with span(benchmark, "benchmark"):
+        return __analyse_moments(benchmark, degree)
+
+
+def __analyse_moments(benchmark: str, degree: int) -> dict:
+    data = {"benchmark": benchmark, "status": str(Status.OK)}
+    try:
+        start = time.time()
+        with span("parse", "preprocessing"):
+            input_parser = InputParser()
+            input_parser.set_source(benchmark)
+            program = input_parser.parse_source()
+        parse_time = time.time() - start
+    except Exception as e:
+        return get_failure_data(benchmark, Status.ERROR, f"Amber failed to parse source: {e}", moments_degree=degree)
+
+    try:
+        start = time.time()
+        variables = [v for v in program.variables if str(v) != LOOP_GUARD_VAR]
+        with redirect_stdout(io.StringIO()):
+            solutions = moments(program, degree, variables)
+        moments_time = time.time() - start
+    except MemoryError:
+        raise
+    except Exception as e:
+        return get_failure_data(benchmark, Status.ERROR, f"Something went wrong while computing moments: {e}",
+                                moments_degree=degree)
+
+    data["moments"] = {f"E[{monomial}]": str(solution) for monomial, solution in solutions.items()}
+    data["timings"] = {"parse": round(parse_time, 4), "moments": round(moments_time, 4)}
+    return data
+
+
+def get_failure_data(benchmark: str, status: Status, error: str = "", moments_degree: int = None) -> dict:
+    """
+    Returns the dictionary representing a benchmark for which Amber could not decide anything or, if a degree of
+    moments is given, for which no moments could be computed
+    """
+    data = {"benchmark": benchmark, "status": str(status)}
+    if moments_degree is None:
+        data.update({"PAST": "Maybe", "AST": "Maybe", "witnesses": []})
+    else:
+        data["moments"] = {}
+    if error:
+        data["error"] = error
+    return data
+
+
+def run_benchmarks(benchmarks: [str], jobs: int = 1, bounds_expression: str = "", timeout: float = None,
+                   max_memory: int = None, structured: bool = False, moments_degree: int = None):
+    """
+    Runs Amber on all given benchmarks with at most 'jobs' worker processes at the same time. A worker gets killed
+    after 'timeout' seconds and its address space is limited to 'max_memory' megabytes. Yields triples of a benchmark,
+    its status and its output in the order in which the benchmarks finish. The output is the printed text (the error if
+    the worker failed) or, if 'structured' is set, the dictionary returned by analyse_benchmark. If additionally a
+    degree of moments is given, the output is the dictionary returned by analyse_moments instead.
+    """
+    # Workers are forked, such that they inherit the loaded modules and the global configuration (e.g. the cache)
+    get_lark_parser()
+    tasks = [
+        partial(__run_isolated, benchmark, bounds_expression, max_memory, structured, moments_degree)
+        for benchmark in benchmarks
+    ]
+    timed_out = lambda i: (Status.TIMEOUT, "", [])
+    runs = run_forked(tasks, __get_death_result, jobs, timeout, timed_out, own_process_group=True)
+    for index, (status, output, events) in runs:
+        add_trace_events(events)
+        if structured and status is not Status.OK:
+            output = get_failure_data(benchmarks[index], status, output, moments_degree=moments_degree)
+        yield benchmarks[index], status, output
+
+
+def __run_isolated(benchmark: str, bounds_expression: str, max_memory: int, structured: bool, moments_degree: int):
+    """
+    Analyses a single benchmark in a worker process and returns its status, output and the trace events of the worker
+    """
+    set_mora_log_level(MORA_LOG_NOTHING)
+    # The worker only reports the trace events it recorded itself and not the ones inherited from the parent
+    clear_trace_events()
+    name_process(benchmark)
+    if max_memory:
+        limit = max_memory * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        if structured and moments_degree is not None:
+            output = analyse_moments(benchmark, moments_degree)
+        elif structured:
+            output = analyse_benchmark(benchmark)
+        else:
+            output = run_benchmark(benchmark, bounds_expression)
+        return Status.OK, output, get_trace_events()
+    except MemoryError:
+        return Status.OOM, "", []
+    except Exception as e:
+        return Status.ERROR, f"{type(e).__name__}: {e}", get_trace_events()
+
+
+def __get_death_result(index: int, exitcode: int):
+    """
+    Returns the status, output and trace events for a worker which died without reporting back. Only a worker which
+    raised a MemoryError or got killed (e.g. by the OOM killer) is known to have run out of memory.
+    """
+    if exitcode in (MEMORY_ERROR_EXIT_CODE, -signal.SIGKILL):
+        return Status.OOM, "", []
+    return Status.ERROR, f"The worker died with exit code {exitcode}", []
@@ -0,0 +1,98 @@
+"""
+This module implements a long-lived server mode for Amber. The heavy dependencies get loaded only once and afterwards
+the server answers requests, each containing a single program, with a JSON result. Requests and replies are
+newline-delimited JSON objects, either on stdin/stdout or over a Unix socket.
+
+Request:  {"id": 1, "source": "x = 10\\nwhile x > 0:\\n    x = x - 1 @ 1/2; x + 1"}
+          {"id": 2, "file": "benchmarks/past/geometric"}
+Reply:    {"id": 1, "PAST": "No", "AST": "Yes", "witnesses": [...], "time": 0.42}
+          {"id": 2, "error": "..."}
+"""
+
+import io
+import json
+import os
+import socketserver
+import stat
+import time
+from contextlib import redirect_stdout
+
+from mora.input import InputParser
+from .decission import decide_termination
+
+
+def handle_request(request: dict) -> dict:
+    """
+    Runs Amber on the program given in a single request and returns the reply. Every program gets analysed in its own
+    analysis context, so no state is shared between requests.
+    """
+    reply = {"id": request.get("id")}
+    try:
+        input_parser = InputParser()
+        if "source" in request:
+            input_parser.set_source_text(request["source"])
+        elif "file" in request:
+            with open(request["file"]) as file:
+                input_parser.set_source_text(file.read(), os.path.basename(request["file"]))
+        else:
+            raise ValueError("A request needs either a 'source' or a 'file'")
+        start = time.time()
+        # Everything Amber logs during the analysis gets discarded, as the output might be the reply channel
+        with redirect_stdout(io.StringIO()):
+            program = input_parser.parse_source()
+            result = decide_termination(program)
+        reply.update(result.to_dict())
+        reply["time"] = round(time.time() - start, 4)
+    except Exception as e:
+        reply["error"] = f"{type(e).__name__}: {e}"
+    return reply
+
+
+def handle_line(line: str) -> str:
+    """
+    Parses a single JSON request and returns the JSON reply
+    """
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("A request has to be a JSON object")
+    except ValueError as e:
+        return json.dumps({"id": None, "error": f"Invalid request: {e}"})
+    return json.dumps(handle_request(request))
+
+
+def serve(input_stream, output_stream):
+    """
+    Answers newline-delimited JSON requests from the input stream until it is closed
+    """
+    for line in input_stream:
+        if not line.strip():
+            continue
+        output_stream.write(handle_line(line) + "\n")
+        output_stream.flush()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            line = line.decode()
+            if not line.strip():
+                continue
+            self.wfile.write((handle_line(line) + "\n").encode())
+            self.wfile.flush()
+
+
+def serve_socket(path: str):
+    """
+    Answers newline-delimited JSON requests on a Unix socket. Connections are handled one after another.
+    A socket left over at the path gets replaced, anything else at the path is never removed.
+    """
+    if os.path.exists(path):
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+        os.remove(path)
+    with socketserver.UnixStreamServer(path, RequestHandler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(path)
@@ -5,11 +5,11 @@ This module implements the general proof rule for AST
 from diofant import symbols, sympify
 
 from . import bound_store
-from .asymptotics import is_dominating_or_same, Direction, Answer
+from .asymptotics import is_dominating_or_same, Direction
 from .expression import get_cases_for_expression, split_expressions_on_rvs
 from .invariance import is_invariant
 from .rule import Rule, Result, Witness
-from .utils import amber_limit
+from .utils import Answer, amber_limit
 
 
 class SupermartingaleRule(Rule):
@@ -23,7 +23,7 @@ class SupermartingaleRule(Rule):
             return result
 
         # Martingale expression has to be <= 0 eventually
-        if not is_invariant(self.martingale_expression, self.program):
+        if not is_invariant(self.martingale_expression, self.context):
             return result
 
         # Eventually one branch of LG_{i+1} - LG_i has to decrease more or equal than constant
@@ -31,7 +31,7 @@ class SupermartingaleRule(Rule):
         if self.program.contains_rvs:
             branches = split_expressions_on_rvs(branches, self.program)
         for branch, prob in branches:
-            bounds = bound_store.get_bounds_of_expr(branch - sympify(self.program.loop_guard))
+            bounds = bound_store.get_bounds_of_expr(self.context, branch - sympify(self.program.loop_guard))
             n = symbols("n", integer=True, positive=True)
             if is_dominating_or_same(bounds.upper, sympify(-1), n, direction=Direction.NegInf):
                 result.AST = Answer.TRUE
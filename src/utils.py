@@ -1,9 +1,13 @@
 import math
+import threading
 from enum import Enum, auto
-from diofant import *
+from functools import lru_cache
+from diofant import Expr, Number, Poly, Symbol, limit, oo, prod, sign, simplify, solve, symbols, sympify
 
-from mora.core import Program, get_solution as get_expected
+from mora.core import Context, Program, get_solution as get_expected
+from mora.trace import traced
 from mora.input import LOOP_GUARD_VAR
+from .roots import get_max_0_by_bounding
 
 LOG_NOTHING = 0
 LOG_ESSENTIAL = 10
@@ -32,22 +36,29 @@ class Answer(Enum):
 
 
 __COUNTER = 0
+__COUNTER_LOCK = threading.Lock()
 
 
 def unique_symbol(s: str, **args):
     """
-    Returns a symbol which every time has a different name
+    Returns a symbol which every time has a different name, also if it gets called from several threads
     """
     global __COUNTER
-    s = symbols(s + str(__COUNTER), **args)
-    __COUNTER += 1
-    return s
+    with __COUNTER_LOCK:
+        index = __COUNTER
+        __COUNTER += 1
+    return symbols(s + str(index), **args)
 
 
+@traced("asymptotics")
 def get_max_0(expression: Expr, n: Symbol):
     """
     Returns the maximum positive 0 of a given expression or 0 if it does not exist
     """
+    max_0 = get_max_0_by_bounding(expression, n)
+    if max_0 is not None:
+        return max_0
+
     n_real = symbols("n", real=True)
     try:
         exp_zeros = solve(expression.xreplace({n: n_real}), n_real)
@@ -169,11 +180,57 @@ def log(message, level):
         print(message)
 
 
+DEFAULT_LIMIT_CACHE_SIZE = 4096
+# The assumptions a symbol can have, which get read through the public is_<assumption> properties
+SYMBOL_ASSUMPTIONS = [
+    "commutative", "complex", "extended_real", "real", "finite", "infinite", "imaginary", "polar", "algebraic",
+    "transcendental", "rational", "irrational", "integer", "noninteger", "even", "odd", "prime", "composite", "zero",
+    "nonzero", "positive", "negative", "nonpositive", "nonnegative"
+]
+
+
+def __compute_limit(expr, n):
+    return limit(expr, n, oo)
+
+
+__cached_limit = lru_cache(maxsize=DEFAULT_LIMIT_CACHE_SIZE)(__compute_limit)
+
+
+def set_limit_cache_size(size: int):
+    """
+    Sets the number of limits which are remembered. Setting it to 0 disables the cache.
+    """
+    global __cached_limit
+    __cached_limit = lru_cache(maxsize=size)(__compute_limit)
+
+
+def get_limit_cache_statistics() -> dict:
+    """
+    Returns the number of hits and misses as well as the current and maximal size of the limit cache
+    """
+    info = __cached_limit.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
+@traced("asymptotics")
 def amber_limit(expr, n):
     if n not in expr.free_symbols:
         return expr
 
-    return limit(expr, n, oo)
+    # Expressions mostly differ in the names of their (unique) constants. Hence, all symbols other than n get
+    # replaced by canonical ones with the same assumptions before looking up the limit, and replaced back afterwards.
+    others = sorted(expr.free_symbols - {n}, key=str)
+    canonical = [Symbol(f"_limit_arg{i}", **get_assumptions(s)) for i, s in enumerate(others)]
+    result = __cached_limit(expr.xreplace(dict(zip(others, canonical))), n)
+    return result.xreplace(dict(zip(canonical, others)))
+
+
+def get_assumptions(s: Symbol) -> dict:
+    """
+    Returns all assumptions which are known for a given symbol, such that a symbol created with them behaves the same
+    """
+    assumptions = {a: getattr(s, f"is_{a}") for a in SYMBOL_ASSUMPTIONS}
+    return {a: value for a, value in assumptions.items() if value is not None}
 
 
 def flatten_substitution_choices(subs_choices):
@@ -200,12 +257,13 @@ def flatten_substitution_choices(subs_choices):
     return result
 
 
-def substitute_deterministic_variables(expr, program: Program):
+def substitute_deterministic_variables(expr, context: Context):
     """
     Substitutes deterministic variables in a given expression with their representation in n.
     """
+    program = context.program
     for symbol, update in program.updates.items():
         if str(symbol) is not LOOP_GUARD_VAR and not update.is_probabilistic:
-            closed_form = get_expected(program, symbol.as_poly(program.variables))
+            closed_form = get_expected(context, symbol.as_poly(program.variables))
             expr = expr.xreplace({symbol: closed_form})
     return expr
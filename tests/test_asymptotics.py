@@ -0,0 +1,142 @@
+import unittest
+from unittest import mock
+
+from diofant import Rational, log, sqrt, symbols
+
+from src import asymptotics
+from src.asymptotics import Direction
+
+prune_numerically = getattr(asymptotics, "__prune_numerically")
+without_constant_multiples = getattr(asymptotics, "__without_constant_multiples")
+
+
+class TestNumericPrefilter(unittest.TestCase):
+
+    def setUp(self):
+        self.n = symbols("n", integer=True, positive=True)
+
+    def test_negative_candidate_is_not_pruned(self):
+        n = self.n
+        # negative on the whole grid, but eventually dominating every other candidate
+        f = n**3 - 10000*n**2
+        pruned = prune_numerically([f, sqrt(n), log(n)], n, Direction.PosInf)
+        self.assertIn(f, pruned)
+
+    def test_constant_in_base_is_not_evaluated(self):
+        n = self.n
+        c = symbols("c", positive=True)
+        # (3 - c)**n looks like 2**n with c = 1, but decays for c > 2
+        pruned = prune_numerically([(3 - c)**n, n**2 * log(n), sqrt(n)], n, Direction.PosInf)
+        self.assertIn(n**2 * log(n), pruned)
+
+    def test_growth_representative_is_kept(self):
+        n = self.n
+        pruned = prune_numerically([n, n * log(n), n**5 * log(n)], n, Direction.PosInf, keep_first=True)
+        self.assertEqual(pruned[0], n)
+        self.assertNotIn(n * log(n), pruned)
+
+    def test_candidate_overtaking_after_grid_is_kept(self):
+        n = self.n
+        # n**3*log(n) exceeds (1001/1000)**n*log(n) by a growing factor on the whole grid, but is overtaken later
+        f = Rational(1001, 1000)**n * log(n)
+        candidates = [n * log(n), n**3 * log(n), f]
+        self.assertIn(f, prune_numerically(candidates, n, Direction.PosInf))
+        asymptotics.set_numeric_prefilter(True)
+        try:
+            bound = asymptotics.dominating(candidates, n)
+        finally:
+            asymptotics.set_numeric_prefilter(False)
+        self.assertTrue(bound.has(Rational(1001, 1000)**n), bound)
+
+    def test_eventual_bound_with_prefilter(self):
+        n = self.n
+        asymptotics.set_numeric_prefilter(True)
+        try:
+            bound = asymptotics.dominating([n**3 - 10000*n**2, sqrt(n), log(n), n * log(n)], n)
+        finally:
+            asymptotics.set_numeric_prefilter(False)
+        self.assertEqual(asymptotics.get_growth(bound, n).power, 3)
+
+
+class TestCandidates(unittest.TestCase):
+
+    def setUp(self):
+        self.n = symbols("n", integer=True, positive=True)
+
+    def tearDown(self):
+        asymptotics.set_bound_jobs(1)
+
+    def test_constant_multiples_collapse(self):
+        n = self.n
+        c = symbols("c", positive=True)
+        d = symbols("d")
+        self.assertEqual(without_constant_multiples([n**2, n**2, c * n**2, 3 * n**2], n), [n**2])
+        self.assertEqual(without_constant_multiples([n**2, -n**2, -c * n**2], n), [n**2, -n**2])
+        # the sign of d is unknown, so d*n**2 is no positive multiple of n**2
+        self.assertEqual(without_constant_multiples([n**2, d * n**2, n * log(n)], n), [n**2, d * n**2, n * log(n)])
+
+    def test_concurrent_comparison_matches_sequential(self):
+        n = self.n
+        candidates = [n**k * log(n) for k in [3, 1, 7, 2, 5]] + [sqrt(n) * log(n), log(n), n**4 * log(log(n))]
+        self.assertGreaterEqual(len(candidates), asymptotics.PARALLEL_CANDIDATES_THRESHOLD)
+        for direction in [Direction.PosInf, Direction.NegInf]:
+            sequential = asymptotics.get_eventual_bound(candidates, n, direction)
+            asymptotics.set_bound_jobs(2)
+            concurrently = getattr(asymptotics, "__get_best_candidate_concurrently")
+            with mock.patch.object(asymptotics, "__get_best_candidate_concurrently", wraps=concurrently) as spy:
+                concurrent = asymptotics.get_eventual_bound(candidates, n, direction)
+            asymptotics.set_bound_jobs(1)
+            self.assertEqual(spy.call_count, 1)
+            self.assertEqual(constant_to_one(concurrent, n), constant_to_one(sequential, n))
+
+
+class TestSimplifyAsymptotically(unittest.TestCase):
+
+    def setUp(self):
+        self.n = symbols("n", integer=True, positive=True)
+
+    def assertCanonical(self, expression, expected, sign=1):
+        n = self.n
+        result = asymptotics.simplify_asymptotically(expression, n)
+        [c] = result.free_symbols - {n}
+        self.assertTrue(c.is_positive)
+        self.assertEqual(result, sign * c * expected)
+
+    def test_dominant_term_gets_positive_constant(self):
+        n = self.n
+        self.assertCanonical(2**(n + 1) * n, n * 2**n)
+        self.assertCanonical(3 * n * 2**n, n * 2**n)
+        self.assertCanonical(5 * 3**n - n * 2**n, 3**n)
+
+    def test_negative_dominant_term_gets_negative_constant(self):
+        n = self.n
+        self.assertCanonical(n - 3 * n**2, n**2, sign=-1)
+        self.assertCanonical(n**5 - 2**n, 2**n, sign=-1)
+
+    def test_expression_tending_to_zero_is_unchanged(self):
+        n = self.n
+        for expression in [Rational(1, 2)**n, n * Rational(1, 3)**n - Rational(1, 2)**n]:
+            self.assertEqual(asymptotics.simplify_asymptotically(expression, n), expression)
+
+    def test_same_growth_as_order(self):
+        n = self.n
+        expressions = [
+            2**(n + 1) * n, 3 * n * 2**n, n - 3 * n**2, n**5 - 2**n, n**3 - 2*n + 7, 5 * 3**n - n * 2**n,
+            Rational(1, 2)**n, n * Rational(1, 3)**n - Rational(1, 2)**n,
+        ]
+        for expression in expressions:
+            by_growth = asymptotics.simplify_asymptotically(expression, n)
+            with mock.patch("src.asymptotics.get_growth", return_value=None):
+                by_order = asymptotics.simplify_asymptotically(expression, n)
+            growth_by_growth = asymptotics.get_growth(by_growth, n)
+            growth_by_order = asymptotics.get_growth(by_order, n)
+            self.assertEqual(
+                (growth_by_growth.power, growth_by_growth.base, growth_by_growth.sign),
+                (growth_by_order.power, growth_by_order.base, growth_by_order.sign),
+                expression
+            )
+
+
+def constant_to_one(expression, n):
+    return expression.xreplace({s: 1 for s in expression.free_symbols - {n}})
+
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from diofant import symbols
+
+from mora import cache
+from mora.cache import get_program_key, set_cache_directory
+from mora.core import core
+from mora.input import InputParser
+from mora.utils import set_log_level, LOG_NOTHING
+
+PROGRAM = """
+x = 0
+y = 1
+while x < 10:
+    y = 2*y @ 1/2; y + 1
+    x = x + y @ 1/3; x - 1
+"""
+
+
+def parse(source):
+    input_parser = InputParser()
+    input_parser.set_source(source)
+    return input_parser.parse_source()
+
+
+class TestCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        set_log_level(LOG_NOTHING)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        set_cache_directory(self.directory.name)
+
+    def tearDown(self):
+        set_cache_directory(None)
+        self.directory.cleanup()
+
+    def test_second_run_loads_solutions(self):
+        x, y = symbols("x y")
+        first = core(parse(PROGRAM), [x**2, x * y])
+        self.assertTrue(os.listdir(self.directory.name))
+
+        with mock.patch("mora.core.compute_solution", side_effect=AssertionError("solution was recomputed")):
+            second = core(parse(PROGRAM), [x**2, x * y])
+        self.assertEqual(first[x**2], second[x**2])
+        self.assertEqual(first[x * y], second[x * y])
+
+    def test_key_contains_version(self):
+        program = parse(PROGRAM)
+        key = get_program_key(program)
+        with mock.patch.object(cache, "CACHE_VERSION", cache.CACHE_VERSION + 1):
+            self.assertNotEqual(get_program_key(program), key)
@@ -0,0 +1,88 @@
+import unittest
+
+from unittest import mock
+
+from diofant import expand, symbols
+
+from mora import core as mora_core
+from mora.core import Context, core, get_recurrence, get_recurrence_system, moments, set_solver_jobs
+from mora.input import InputParser
+from mora.utils import get_monoms, set_log_level, LOG_NOTHING
+
+PROGRAM_2D = """
+x = 0
+y = 0
+while x**2 + y**2 < 100:
+    x = x + 1 @ 1/2; x - 1
+    y = y + 1 @ 1/2; y - 1
+"""
+
+PROGRAM_COUPLED = """
+x = 0
+y = 0
+while y < 100:
+    x = x + 1 @ 1/2; x - 1
+    y = y + x @ 1/3; y + 2
+"""
+
+
+def parse(source):
+    input_parser = InputParser()
+    input_parser.set_source(source)
+    return input_parser.parse_source()
+
+
+class TestCore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        set_log_level(LOG_NOTHING)
+
+    def tearDown(self):
+        set_solver_jobs(1)
+
+    def test_concurrent_solver_matches_sequential(self):
+        x, y = symbols("x y")
+        sequential = core(parse(PROGRAM_2D), [x**2 * y**2, x**4, y**3])
+        set_solver_jobs(2)
+        concurrent = core(parse(PROGRAM_2D), [x**2 * y**2, x**4, y**3])
+        self.assertEqual(sequential, concurrent)
+        self.assertEqual(sequential[x**2 * y**2].expand(), symbols("n", integer=True, positive=True)**2)
+
+    def test_recurrence_system_is_triangular(self):
+        x, y = symbols("x y")
+        program = parse(PROGRAM_2D)
+        context = Context(program)
+        order = get_recurrence_system(context, (x**2 * y**2).as_poly(program.variables))
+        self.assertEqual(order[-1].as_expr(), x**2 * y**2)
+        keys = [m.as_expr() for m in order]
+        self.assertEqual(len(keys), len(set(keys)))
+        for i, m in enumerate(order):
+            for dependency in get_monoms(get_recurrence(context, m)):
+                # every monomial only depends on itself and on monomials before it
+                self.assertIn(dependency.as_expr(), keys[:i + 1])
+
+    def test_moments_match_separate_core_calls(self):
+        x, y = symbols("x y")
+        program = parse(PROGRAM_COUPLED)
+        with mock.patch("mora.core.compute_recurrence", wraps=mora_core.compute_recurrence) as batch, \
+                mock.patch("mora.core.solve_monomial_recurrence", wraps=mora_core.solve_monomial_recurrence) as solve:
+            result = moments(program, 3, [x, y])
+        self.assertEqual(set(result.keys()), {v**k for v in [x, y] for k in [1, 2, 3]})
+
+        separate_calls = 0
+        for monomial, solution in result.items():
+            with mock.patch("mora.core.compute_recurrence", wraps=mora_core.compute_recurrence) as separate:
+                expected = core(parse(PROGRAM_COUPLED), [monomial])[monomial]
+            separate_calls += separate.call_count
+            self.assertEqual(expand(solution - expected), 0, monomial)
+
+        # sharing the context computes the recurrence of every (sub-)monomial only once
+        computed = [call.args[1].as_expr() for call in batch.call_args_list]
+        self.assertEqual(len(computed), len(set(computed)))
+        self.assertLess(batch.call_count, separate_calls)
+        # and every (sub-)monomial gets solved only once
+        solved = [call.args[1].as_expr() for call in solve.call_args_list]
+        self.assertEqual(len(solved), len(set(solved)))
+        self.assertIn(x**2, solved)
+
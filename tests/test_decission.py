@@ -0,0 +1,68 @@
+import glob
+import unittest
+
+from mora.input import InputParser
+from mora.utils import set_log_level as set_mora_log_level, LOG_NOTHING as MORA_LOG_NOTHING
+from src import decission
+from src.decission import decide_termination, set_parallel_rules
+from src.result import Result
+from src.rule import Witness
+from src.utils import Answer, set_log_level, LOG_NOTHING
+
+benchmarks = sorted(glob.glob("tests/benchmarks/*/*"))
+
+
+class KindWitness(Witness):
+
+    def __init__(self, kind):
+        super(KindWitness, self).__init__(kind)
+
+
+def parse(benchmark):
+    input_parser = InputParser()
+    input_parser.set_source(benchmark)
+    return input_parser.parse_source()
+
+
+def test_generator_parallel_rules(benchmark):
+    def test(self):
+        sequential = decide_termination(parse(benchmark))
+        set_parallel_rules(True)
+        parallel = decide_termination(parse(benchmark))
+        self.assertEqual(parallel.PAST, sequential.PAST, benchmark)
+        self.assertEqual(parallel.AST, sequential.AST, benchmark)
+        self.assertTrue(len(parallel.witnesses) > 0, benchmark)
+    return test
+
+
+class TestDecission(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        set_mora_log_level(MORA_LOG_NOTHING)
+        set_log_level(LOG_NOTHING)
+
+    def tearDown(self):
+        set_parallel_rules(False)
+
+    def test_merge_only_takes_witnesses_of_decided_properties(self):
+        merge = getattr(decission, "__merge_rule_result")
+        result = Result()
+        result.AST = Answer.TRUE
+        rule_result = Result()
+        rule_result.PAST = Answer.FALSE
+        rule_result.AST = Answer.FALSE
+        rule_result.add_witness(KindWitness("Not PAST"))
+        rule_result.add_witness(KindWitness("Not AST"))
+        merge(result, rule_result)
+        self.assertEqual(result.PAST, Answer.FALSE)
+        self.assertEqual(result.AST, Answer.TRUE)
+        self.assertEqual([w.kind for w in result.witnesses], ["Not PAST"])
+
+
+for b in benchmarks:
+    setattr(TestDecission, f"test_parallel_rules_{b}", test_generator_parallel_rules(b))
+
+
+if __name__ == '__main__':
+    unittest.main()
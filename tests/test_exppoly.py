@@ -0,0 +1,50 @@
+import unittest
+
+from diofant import Rational, simplify, symbols
+
+from mora.exppoly import ExpPoly, solve_recurrence
+
+
+class TestSolveRecurrence(unittest.TestCase):
+    """
+    Every test solves f(0) = initial_value; f(n+1) = coefficient * f(n) + inhom_part and compares the solution with
+    a closed form computed by hand.
+    """
+
+    def setUp(self):
+        self.n = symbols("n", integer=True, positive=True)
+
+    def assertSolution(self, coefficient, inhom_part, initial_value, expected):
+        n = self.n
+        solution = solve_recurrence(coefficient, ExpPoly.from_expr(inhom_part, n), initial_value)
+        self.assertIsNotNone(solution)
+        self.assertEqual(simplify(solution.as_expr(n) - expected), 0)
+
+    def test_non_resonant(self):
+        n = self.n
+        self.assertSolution(2, 1, 0, 2**n - 1)
+        self.assertSolution(Rational(1, 2), 3**n, 1, Rational(2, 5) * 3**n + Rational(3, 5) * Rational(1, 2)**n)
+
+    def test_resonant_constant(self):
+        n = self.n
+        self.assertSolution(1, 1, 5, n + 5)
+
+    def test_resonant_polynomial(self):
+        n = self.n
+        self.assertSolution(1, n, 0, n * (n - 1) / 2)
+        self.assertSolution(2, 2**n, 0, n * 2**(n - 1))
+        self.assertSolution(1, n**2, 1, 1 + (n - 1) * n * (2*n - 1) / 6)
+
+    def test_coefficient_zero(self):
+        n = self.n
+        self.assertSolution(0, n**2 + 2**n, 7, (n - 1)**2 + 2**(n - 1))
+
+    def test_symbolic_base(self):
+        n = self.n
+        b = symbols("b", positive=True)
+        d = b - Rational(1, 2)
+        self.assertSolution(Rational(1, 2), b**n, 1, b**n / d + (1 - 1 / d) * Rational(1, 2)**n)
+        self.assertSolution(b, b**n, 0, n * b**(n - 1))
+
+    def test_zero_base(self):
+        self.assertIsNone(solve_recurrence(2, ExpPoly({(0, 0): 1}), 0))
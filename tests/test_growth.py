@@ -0,0 +1,43 @@
+import unittest
+from unittest import mock
+
+from diofant import Rational, symbols
+
+from src.asymptotics import Direction, is_dominating_or_same, is_dominating_or_same_by_growth
+from src.growth import get_growth
+
+
+class TestGrowthDominance(unittest.TestCase):
+    """
+    The dominance check via growth classes has to agree with the original check via limits
+    """
+
+    def setUp(self):
+        n = symbols("n", integer=True, positive=True)
+        self.n = n
+        half, third = Rational(1, 2), Rational(1, 3)
+        self.pairs = [
+            # same base, different power
+            (n**2, 3 * n**3), (n * 2**n, 5 * 2**n), (-n**2, n),
+            # different bases
+            (2**n, 3**n), (half**n, n), (n**10, Rational(3, 2)**n), (-(3**n), 2**n),
+            # both go to -oo
+            (-n**2, -n), (-(2**n), -n**5), (-3 * n, -n),
+            # constants of different signs
+            (Rational(3), Rational(-2)), (Rational(-1), Rational(5)), (Rational(4), n - n),
+            # expressions tending to 0
+            (half**n, third**n), (half**n, -(third**n)), (-(half**n), n * third**n), (half**n, Rational(0)),
+        ]
+
+    def test_growth_agrees_with_limits(self):
+        n = self.n
+        for f1, f2 in self.pairs:
+            for a, b in [(f1, f2), (f2, f1)]:
+                for direction in Direction:
+                    growth_a, growth_b = get_growth(a, n), get_growth(b, n)
+                    self.assertIsNotNone(growth_a, a)
+                    self.assertIsNotNone(growth_b, b)
+                    by_growth = is_dominating_or_same_by_growth(growth_a, growth_b, direction)
+                    with mock.patch("src.asymptotics.get_growth", return_value=None):
+                        by_limits = is_dominating_or_same(a, b, n, direction)
+                    self.assertEqual(bool(by_growth), bool(by_limits), (a, b, direction))
@@ -0,0 +1,90 @@
+import unittest
+
+from diofant import Rational, binomial, expand, simplify, symbols
+
+from mora.utils import RandomVar, Update
+
+
+def finite_moment(distribution: dict, k: int):
+    return sum(p * x**k for x, p in distribution.items())
+
+
+class TestMoments(unittest.TestCase):
+
+    def assertMoments(self, rv: RandomVar, expected: list):
+        moments = rv.moments(len(expected) - 1)
+        for k, (moment, e) in enumerate(zip(moments, expected)):
+            self.assertEqual(simplify(moment - e), 0, f"{rv.distribution}, k = {k}")
+
+    def test_gauss(self):
+        mu, s = symbols("mu s", positive=True)
+        self.assertMoments(RandomVar("gauss", [mu, s]), [
+            1, mu, mu**2 + s, mu**3 + 3*mu*s, mu**4 + 6*mu**2*s + 3*s**2,
+            mu**5 + 10*mu**3*s + 15*mu*s**2,
+            mu**6 + 15*mu**4*s + 45*mu**2*s**2 + 15*s**3,
+        ])
+        # The moments above 4 used to be floats from scipy
+        self.assertEqual(RandomVar("gauss", [Rational(1), Rational(2)]).compute_moment(6), 1 + 30 + 180 + 120)
+
+    def test_laplace(self):
+        mu, b = symbols("mu b", positive=True)
+        self.assertMoments(RandomVar("laplace", [mu, b]), [
+            1, mu, mu**2 + 2*b**2, mu**3 + 6*mu*b**2, mu**4 + 12*mu**2*b**2 + 24*b**4,
+        ])
+
+    def test_binomial(self):
+        n, p = 5, Rational(1, 3)
+        distribution = {x: binomial(n, x) * p**x * (1 - p)**(n - x) for x in range(n + 1)}
+        self.assertMoments(RandomVar("binomial", [n, p]), [finite_moment(distribution, k) for k in range(8)])
+
+        n, p = symbols("n p", positive=True)
+        self.assertMoments(RandomVar("binomial", [n, p]), [1, n*p, n*p*(1 - p) + n**2*p**2])
+
+    def test_hypergeometric(self):
+        N, K, n = 10, 4, 3
+        distribution = {x: binomial(K, x) * binomial(N - K, n - x) / binomial(N, n) for x in range(min(K, n) + 1)}
+        self.assertMoments(RandomVar("hypergeometric", [N, K, n]), [finite_moment(distribution, k) for k in range(8)])
+        # The factorial moments vanish from some point on, which must not divide by zero
+        self.assertMoments(RandomVar("hypergeometric", [4, 4, 2]), [2**k for k in range(6)])
+
+    def test_geometric(self):
+        p = Rational(1, 3)
+        # support starting at 1: E[X] = 1/p, E[X^2] = (2 - p)/p^2, E[X^3] = (6 - 6p + p^2)/p^3
+        self.assertMoments(RandomVar("geometric", [p]), [1, 3, 15, 111])
+        q = symbols("q", positive=True)
+        self.assertMoments(RandomVar("geometric", [q]), [1, 1/q, (2 - q)/q**2, (6 - 6*q + q**2)/q**3])
+
+    def test_beta(self):
+        a, b = symbols("a b", positive=True)
+        self.assertMoments(RandomVar("beta", [a, b]), [
+            1, a/(a + b), a*(a + 1)/((a + b)*(a + b + 1)), a*(a + 1)*(a + 2)/((a + b)*(a + b + 1)*(a + b + 2)),
+        ])
+
+    def test_chi_squared(self):
+        k = symbols("k", positive=True)
+        self.assertMoments(RandomVar("chi-squared", [k]), [1, k, k*(k + 2), k*(k + 2)*(k + 4)])
+
+    def test_moments_are_memoized(self):
+        rv = RandomVar("gauss", [Rational(0), Rational(1)])
+        self.assertEqual(rv.moments(4), [1, 0, 1, 0, 3])
+        self.assertIs(rv.moments(2)[2], rv.compute_moment(2))
+
+    def test_poly_powers_of_branches(self):
+        x, y = symbols("x y")
+        update = Update(x, "x + y @ 1/3; 2*x", program_variables=[x, y])
+        powers = update.poly_powers([x, y], 2)
+        self.assertEqual([p.as_expr() for p in powers], [1, expand((x + y)/3 + 4*x/3),
+                                                         expand((x + y)**2/3 + 8*x**2/3)])
+        extended = update.poly_powers([x, y], 4)
+        # the memoized powers are reused when the table gets extended
+        self.assertIs(extended[2], powers[2])
+        self.assertEqual(extended[4].as_expr(), expand((x + y)**4/3 + 2*(2*x)**4/3))
+        # the table is kept per tuple of generators
+        self.assertEqual(update.poly_powers([x, y, symbols("z")], 1)[1].gens, (x, y, symbols("z")))
+
+    def test_poly_powers_of_random_variables(self):
+        x = symbols("x")
+        update = Update(x, "RV(gauss, 0, 1)", program_variables=[x])
+        powers = update.poly_powers([x], 4)
+        self.assertEqual([p.as_expr() for p in powers], [1, 0, 1, 0, 3])
+        self.assertIs(update.poly_powers([x], 2)[2], powers[2])
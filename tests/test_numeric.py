@@ -0,0 +1,70 @@
+import unittest
+from fractions import Fraction
+from unittest import mock
+
+import numpy
+from diofant import symbols
+
+from mora.core import Context, get_solution
+from mora.input import InputParser
+from mora.numeric import evaluate_moments
+from mora.utils import set_log_level, LOG_NOTHING
+
+PROGRAM = """
+x = 0
+y = 1
+while x < 100:
+    x = x + 1 @ 1/3; x - 1
+    y = 2*y @ 1/2; y + 1
+"""
+
+# From 1 to 3 the state gets advanced step by step, from 3 to 300 with a matrix power
+N_VALUES = [300, 1, 2, 3]
+
+
+def parse(source):
+    input_parser = InputParser()
+    input_parser.set_source(source)
+    return input_parser.parse_source()
+
+
+class TestNumeric(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        set_log_level(LOG_NOTHING)
+
+    def setUp(self):
+        x, y = symbols("x y")
+        self.program = parse(PROGRAM)
+        self.monomials = [x, x**2, y, x * y**2, 3 * x**3]
+        context = Context(self.program)
+        n = symbols("n", integer=True, positive=True)
+        self.expected = {}
+        for m in self.monomials:
+            goal = m.as_poly(self.program.variables)
+            closed_form = goal.coeffs()[0] * get_solution(context, goal.monic())
+            self.expected[m] = [closed_form.xreplace({n: k}) for k in N_VALUES]
+
+    def evaluate(self, exact):
+        matrix_power = numpy.linalg.matrix_power
+        with mock.patch("numpy.linalg.matrix_power", wraps=matrix_power) as power:
+            result = evaluate_moments(self.program, self.monomials, N_VALUES, exact=exact)
+        self.assertEqual(power.call_count, 1)
+        return result
+
+    def test_exact_values_match_closed_forms(self):
+        result = self.evaluate(exact=True)
+        for m in self.monomials:
+            expected = [Fraction(int(e.numerator), int(e.denominator)) for e in self.expected[m]]
+            self.assertEqual(list(result[m]), expected, m)
+
+    def test_float_values_match_closed_forms(self):
+        result = self.evaluate(exact=False)
+        for m in self.monomials:
+            expected = [float(e) for e in self.expected[m]]
+            numpy.testing.assert_allclose(result[m], expected, rtol=1e-9, err_msg=str(m))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import signal
+import time
+import unittest
+from functools import partial
+
+from mora.processes import MEMORY_ERROR_EXIT_CODE, run_forked
+
+
+def square(x):
+    return x * x
+
+
+def die():
+    os._exit(1)
+
+
+def run_out_of_memory():
+    raise MemoryError()
+
+
+def kill_itself():
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+class TestProcesses(unittest.TestCase):
+
+    def test_all_results_get_yielded(self):
+        tasks = [partial(square, x) for x in range(5)]
+        self.assertEqual(sorted(run_forked(tasks, jobs=2)), [(x, x * x) for x in range(5)])
+
+    def test_fallback_runs_for_dead_process(self):
+        results = dict(run_forked([partial(square, 3), die], fallback=lambda i, exitcode: (-i, exitcode)))
+        self.assertEqual(results, {0: 9, 1: (-1, 1)})
+        self.assertEqual(dict(run_forked([die])), {0: None})
+
+    def test_exit_codes_of_dead_processes(self):
+        tasks = [run_out_of_memory, kill_itself]
+        results = dict(run_forked(tasks, fallback=lambda i, exitcode: exitcode))
+        self.assertEqual(results, {0: MEMORY_ERROR_EXIT_CODE, 1: -signal.SIGKILL})
+
+    def test_timeout_kills_process(self):
+        start = time.monotonic()
+        tasks = [partial(time.sleep, 60), partial(square, 2)]
+        results = dict(run_forked(tasks, timeout=0.5, on_timeout=lambda i: "timeout", own_process_group=True))
+        self.assertEqual(results, {0: "timeout", 1: 4})
+        self.assertLess(time.monotonic() - start, 30)
+
+    def test_closing_kills_remaining_processes(self):
+        start = time.monotonic()
+        runs = run_forked([partial(square, 2), partial(time.sleep, 60)])
+        self.assertEqual(next(runs), (0, 4))
+        runs.close()
+        self.assertLess(time.monotonic() - start, 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from diofant import Rational, symbols
+
+from src.roots import get_max_0_by_bounding, MAX_SCAN_LENGTH
+
+
+class TestMax0ByBounding(unittest.TestCase):
+
+    def setUp(self):
+        self.n = symbols("n", integer=True, positive=True)
+
+    def test_integer_root(self):
+        n = self.n
+        self.assertEqual(get_max_0_by_bounding((n - 3) * (n - 7), n), 7)
+        self.assertEqual(get_max_0_by_bounding(n - 12, n), 12)
+
+    def test_irrational_root(self):
+        n = self.n
+        self.assertEqual(get_max_0_by_bounding(n**2 - 2, n), 2)
+        self.assertEqual(get_max_0_by_bounding(10 - n**3, n), 3)
+
+    def test_repeated_root(self):
+        n = self.n
+        self.assertEqual(get_max_0_by_bounding((n - 5)**2, n), 5)
+        self.assertEqual(get_max_0_by_bounding((n - 5)**3 * (n - 1), n), 5)
+
+    def test_no_positive_root(self):
+        n = self.n
+        self.assertEqual(get_max_0_by_bounding(n**2 + 1, n), 0)
+        self.assertEqual(get_max_0_by_bounding(n + 3, n), 0)
+        self.assertEqual(get_max_0_by_bounding(2**n + n, n), 0)
+
+    def test_exponential_polynomial(self):
+        n = self.n
+        self.assertEqual(get_max_0_by_bounding(2**n - n**5, n), 23)
+        self.assertEqual(get_max_0_by_bounding(n**5 - 2**n, n), 23)
+
+    def test_dominance_beyond_scan_length(self):
+        n = self.n
+        base = 1 + Rational(1, MAX_SCAN_LENGTH)
+        self.assertIsNone(get_max_0_by_bounding(base**n - n, n))
+
+    def test_unsupported_expressions(self):
+        n = self.n
+        c = symbols("c", positive=True)
+        self.assertIsNone(get_max_0_by_bounding(n - c, n))
@@ -0,0 +1,53 @@
+import signal
+import unittest
+from unittest import mock
+
+from mora.processes import MEMORY_ERROR_EXIT_CODE
+from src import runner
+from src.runner import Status, analyse_moments, run_benchmarks
+
+BENCHMARK = "tests/benchmarks/past/biased_random_walk_bernoulli"
+
+
+class TestRunner(unittest.TestCase):
+
+    def test_failing_worker_is_an_error_with_memory_limit(self):
+        [(benchmark, status, output)] = run_benchmarks([BENCHMARK], bounds_expression="x +* (", max_memory=2000)
+        self.assertEqual((benchmark, status), (BENCHMARK, Status.ERROR))
+        self.assertIn("SympifyError", output)
+
+    def test_failing_worker_error_in_structured_output(self):
+        # the worker is forked, so it inherits the patch
+        with mock.patch("src.runner.analyse_benchmark", side_effect=ValueError("broken")):
+            [(_, status, data)] = run_benchmarks([BENCHMARK], max_memory=2000, structured=True)
+        self.assertEqual(status, Status.ERROR)
+        self.assertEqual(data["status"], "ERROR")
+        self.assertEqual(data["error"], "ValueError: broken")
+
+    def test_successful_worker_with_memory_limit(self):
+        [(_, status, data)] = run_benchmarks([BENCHMARK], max_memory=2000, structured=True)
+        self.assertEqual(status, Status.OK)
+        self.assertEqual((data["PAST"], data["AST"]), ("Yes", "Yes"))
+
+    def test_analyse_moments(self):
+        data = analyse_moments(BENCHMARK, 2)
+        self.assertEqual(data["status"], "OK")
+        self.assertEqual(data["moments"], {
+            "E[s]": "1/10", "E[s**2]": "1/10", "E[x]": "-n/10 + 10", "E[x**2]": "n**2/100 - 191*n/100 + 100",
+        })
+        [(_, status, output)] = run_benchmarks([BENCHMARK], max_memory=2000, structured=True, moments_degree=2)
+        self.assertEqual(status, Status.OK)
+        self.assertEqual(output["moments"], data["moments"])
+
+    def test_only_memory_deaths_are_out_of_memory(self):
+        get_death_result = getattr(runner, "__get_death_result")
+        self.assertEqual(get_death_result(0, MEMORY_ERROR_EXIT_CODE)[0], Status.OOM)
+        self.assertEqual(get_death_result(0, -signal.SIGKILL)[0], Status.OOM)
+        status, output, _ = get_death_result(0, 1)
+        self.assertEqual(status, Status.ERROR)
+        self.assertIn("exit code 1", output)
+        self.assertEqual(get_death_result(0, -signal.SIGSEGV)[0], Status.ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+from unittest import mock
+
+from mora.utils import set_log_level as set_mora_log_level, LOG_NOTHING as MORA_LOG_NOTHING
+from src.server import handle_line, serve_socket
+from src.utils import set_log_level, LOG_NOTHING
+
+BENCHMARK = "tests/benchmarks/past/biased_random_walk_bernoulli"
+
+
+def request(**fields) -> dict:
+    return json.loads(handle_line(json.dumps(fields)))
+
+
+class TestServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        set_mora_log_level(MORA_LOG_NOTHING)
+        set_log_level(LOG_NOTHING)
+
+    def test_file_request(self):
+        reply = request(id=1, file=BENCHMARK)
+        self.assertEqual(reply["id"], 1)
+        self.assertEqual((reply["PAST"], reply["AST"]), ("Yes", "Yes"))
+        self.assertTrue(reply["witnesses"])
+
+    def test_source_request(self):
+        with open(BENCHMARK) as file:
+            reply = request(id=2, source=file.read())
+        self.assertEqual((reply["PAST"], reply["AST"]), ("Yes", "Yes"))
+
+    def test_source_is_never_a_path(self):
+        reply = request(id=3, source=BENCHMARK)
+        self.assertEqual(reply["id"], 3)
+        self.assertNotIn("PAST", reply)
+        self.assertIn("error", reply)
+
+    def test_missing_file(self):
+        reply = request(id=4, file="tests/benchmarks/missing")
+        self.assertNotIn("PAST", reply)
+        self.assertTrue(reply["error"].startswith("FileNotFoundError"), reply["error"])
+
+    def test_invalid_requests(self):
+        self.assertIn("error", request(id=5))
+        reply = json.loads(handle_line("{not json"))
+        self.assertIsNone(reply["id"])
+        self.assertTrue(reply["error"].startswith("Invalid request"))
+        self.assertIn("error", json.loads(handle_line("[1, 2]")))
+
+    def test_socket_path_which_is_no_socket_is_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "amber.sock")
+            with open(path, "w") as file:
+                file.write("no socket")
+            with self.assertRaises(FileExistsError):
+                serve_socket(path)
+            with open(path) as file:
+                self.assertEqual(file.read(), "no socket")
+
+    def test_stale_socket_gets_replaced(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "amber.sock")
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(path)
+            stale.close()
+            with mock.patch("socketserver.UnixStreamServer", side_effect=RuntimeError("not serving")):
+                with self.assertRaises(RuntimeError):
+                    serve_socket(path)
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
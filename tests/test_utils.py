@@ -0,0 +1,48 @@
+import threading
+import unittest
+
+from diofant import oo, symbols
+
+from src.utils import DEFAULT_LIMIT_CACHE_SIZE, amber_limit, get_limit_cache_statistics, set_limit_cache_size, \
+    unique_symbol
+
+
+class TestUtils(unittest.TestCase):
+
+    def test_unique_symbols_from_several_threads(self):
+        names = []
+
+        def create():
+            names.extend(str(unique_symbol("c")) for _ in range(1000))
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(names)), 8000)
+
+    def test_limit_cache_ignores_names_of_constants(self):
+        n = symbols("n", integer=True, positive=True)
+        set_limit_cache_size(DEFAULT_LIMIT_CACHE_SIZE)
+        try:
+            c1 = unique_symbol("c", positive=True, real=True)
+            c2 = unique_symbol("c", positive=True, real=True)
+            self.assertEqual(amber_limit(c1 * n - 1, n), oo)
+            self.assertEqual(amber_limit(c2 * n - 1, n), oo)
+            statistics = get_limit_cache_statistics()
+            self.assertEqual((statistics["misses"], statistics["hits"]), (1, 1))
+
+            # the result refers to the constants of the expression it was asked for
+            d1 = unique_symbol("d", positive=True)
+            d2 = unique_symbol("d", positive=True)
+            self.assertEqual(amber_limit(d1 + 1 / n, n), d1)
+            self.assertEqual(amber_limit(d2 + 1 / n, n), d2)
+            statistics = get_limit_cache_statistics()
+            self.assertEqual((statistics["misses"], statistics["hits"]), (2, 2))
+        finally:
+            set_limit_cache_size(DEFAULT_LIMIT_CACHE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()